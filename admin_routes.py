@@ -5,7 +5,7 @@ Admin routes for system management and monitoring
 from flask import render_template, request, redirect, url_for, flash, jsonify
 from app import app, db
 from models import AgentInstance, TaskRequest, UserSession, SystemMetrics, User
-from agent_master_controller import master_controller
+from agent_master_controller import get_master_controller
 import logging
 from datetime import datetime, timedelta
 
@@ -50,7 +50,7 @@ def admin_dashboard():
     
     # Performance metrics
     performance_metrics = {
-        'system_uptime': str(datetime.utcnow() - master_controller.start_time),
+        'system_uptime': str(datetime.utcnow() - get_master_controller().start_time),
         'avg_task_completion_time': 0,
         'tasks_per_hour': 0,
         'error_rate': 0
@@ -156,7 +156,7 @@ def admin_scale_pool(pool_name):
     try:
         if action == 'scale_up':
             # Create new agent
-            new_agent = master_controller._create_agent_instance(pool_name)
+            new_agent = get_master_controller()._create_agent_instance(pool_name)
             with db.session.begin():
                 db.session.add(new_agent)
             
@@ -254,7 +254,7 @@ def admin_retry_task(task_id):
             task.agent_id = None
         
         # Resubmit to master controller
-        master_controller.task_queue.put((task.priority, datetime.utcnow().timestamp(), task.task_id))
+        get_master_controller().requeue_task(task.task_id, task.priority)
         
         flash(f'Task {task_id} resubmitted for processing', 'success')
         logger.info(f"Admin retried task: {task_id}")
@@ -269,19 +269,20 @@ def admin_retry_task(task_id):
 def admin_system():
     """System configuration and settings"""
     # Get master controller status
-    controller_status = master_controller.get_system_status()
-    
+    controller = get_master_controller()
+    controller_status = controller.get_system_status()
+
     # Get configuration settings
     system_config = {
-        'max_agents_per_pool': master_controller.max_agents_per_pool,
-        'health_check_interval': master_controller.health_check_interval,
+        'max_agents_per_pool': controller.max_agents_per_pool,
+        'health_check_interval': controller.health_check_interval,
         'auto_scaling_enabled': True,  # TODO: Make this configurable
         'recovery_enabled': True
     }
     
     # Get AI provider status
-    from ai_providers import AIProviderManager
-    ai_manager = AIProviderManager()
+    from ai_providers import get_ai_provider_manager
+    ai_manager = get_ai_provider_manager()
     provider_status = ai_manager.health_check()
     provider_usage = ai_manager.get_usage_stats()
     
@@ -12,13 +12,13 @@ from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
-from collections import defaultdict, deque
+from collections import Counter, defaultdict, deque
 import uuid
-import queue
+import heapq
 
 from app import db
 from models import AgentInstance, TaskRequest, SystemMetrics, UserSession
-from ai_providers import AIProviderManager
+from ai_providers import get_ai_provider_manager
 from ai_providers_enhanced import initialize_enhanced_ai_provider, AssistantMode
 from agent_pools import SpecializedAgentPools
 
@@ -34,7 +34,7 @@ class AgentMasterController:
         self.health_check_interval = health_check_interval
         
         # Initialize AI providers and specialized agents
-        self.ai_providers = AIProviderManager()
+        self.ai_providers = get_ai_provider_manager()
         self.enhanced_ai_providers = initialize_enhanced_ai_provider()
         self.specialized_pools = SpecializedAgentPools(self.ai_providers)
         
@@ -47,8 +47,12 @@ class AgentMasterController:
             'general': []
         }
         
-        # Task management
-        self.task_queue = queue.PriorityQueue()
+        # Task management: bare heap under one condition variable
+        # instead of queue.PriorityQueue - the same lock, but without
+        # PriorityQueue's extra method dispatch per operation, and the
+        # dispatcher blocks on the condition instead of polling
+        self._task_heap: list = []
+        self._task_cv = threading.Condition()
         self.active_tasks: Dict[str, TaskRequest] = {}
         self.completed_tasks: deque = deque(maxlen=1000)
         
@@ -196,12 +200,26 @@ class AgentMasterController:
             raise
         
         # Add to priority queue (lower number = higher priority)
-        self.task_queue.put((priority, time.time(), task_id))
+        with self._task_cv:
+            heapq.heappush(self._task_heap, (priority, time.time(), task_id))
+            self._task_cv.notify()
         self.active_tasks[task_id] = task
         
         logger.info(f"Task submitted: {task_id} with capabilities: {required_capabilities}")
         return task_id
-    
+
+    def requeue_task(self, task_id: str, priority: int = 5):
+        """Push an existing task back onto the dispatch queue
+
+        For tasks that already have a TaskRequest row (e.g. an admin
+        retry): no new task is created, the id just re-enters the
+        priority heap and wakes the dispatcher.
+        """
+        with self._task_cv:
+            heapq.heappush(self._task_heap, (priority, time.time(), task_id))
+            self._task_cv.notify()
+        logger.info(f"Task requeued: {task_id} with priority {priority}")
+
     def _analyze_query_capabilities(self, query: str) -> List[str]:
         """Analyze query to determine required capabilities and agent pool"""
         query_lower = query.lower()
@@ -264,9 +282,17 @@ class AgentMasterController:
             with app.app_context():
                 while self.running:
                     try:
-                        # Get task from queue with timeout
-                        priority, timestamp, task_id = self.task_queue.get(timeout=1.0)
-                        
+                        # Wait for a task; the condition wakes us on
+                        # submit, so there is no polling interval
+                        with self._task_cv:
+                            self._task_cv.wait_for(
+                                lambda: self._task_heap or not self.running,
+                                timeout=1.0
+                            )
+                            if not self._task_heap:
+                                continue
+                            priority, timestamp, task_id = heapq.heappop(self._task_heap)
+
                         # Get task from database
                         task = db.session.query(TaskRequest).filter_by(task_id=task_id).first()
                         if not task:
@@ -281,10 +307,10 @@ class AgentMasterController:
                         else:
                             # No suitable agent available, requeue with delay
                             time.sleep(0.1)
-                            self.task_queue.put((priority, timestamp, task_id))
-                    
-                    except queue.Empty:
-                        continue
+                            with self._task_cv:
+                                heapq.heappush(self._task_heap, (priority, timestamp, task_id))
+                                self._task_cv.notify()
+
                     except Exception as e:
                         logger.error(f"Error in task processor: {e}")
         
@@ -483,7 +509,7 @@ class AgentMasterController:
             
             # Scale up if all agents are busy and we have pending tasks
             if len(busy_agents) == len(active_agents) and len(active_agents) < self.max_agents_per_pool:
-                if not self.task_queue.empty():
+                if self._task_heap:
                     try:
                         new_agent = self._create_agent_instance(pool_name)
                         db.session.add(new_agent)
@@ -510,20 +536,30 @@ class AgentMasterController:
             agents = db.session.query(AgentInstance).all()
             tasks = db.session.query(TaskRequest).all()
             
+            # Single Counter pass over each list instead of one scan and
+            # one intermediate list per status
+            agent_counts = Counter(a.status for a in agents)
+            task_counts = Counter(t.status for t in tasks)
+            
             total_agents = len(agents)
-            active_agents = len([a for a in agents if a.status in ['idle', 'busy']])
-            idle_agents = len([a for a in agents if a.status == 'idle'])
-            failed_agents = len([a for a in agents if a.status == 'failed'])
+            active_agents = agent_counts['idle'] + agent_counts['busy']
+            idle_agents = agent_counts['idle']
+            failed_agents = agent_counts['failed']
             
             total_requests = len(tasks)
-            successful_requests = len([t for t in tasks if t.status == 'completed'])
-            failed_requests = len([t for t in tasks if t.status == 'failed'])
+            successful_requests = task_counts['completed']
+            failed_requests = task_counts['failed']
             
             avg_response_time = 0.0
             if successful_requests > 0:
-                response_times = [t.processing_time for t in tasks if t.processing_time]
-                if response_times:
-                    avg_response_time = sum(response_times) / len(response_times)
+                time_sum = 0.0
+                time_count = 0
+                for t in tasks:
+                    if t.processing_time:
+                        time_sum += t.processing_time
+                        time_count += 1
+                if time_count:
+                    avg_response_time = time_sum / time_count
             
             # Save metrics to database
             try:
@@ -552,16 +588,19 @@ class AgentMasterController:
         agents = db.session.query(AgentInstance).all()
         tasks = db.session.query(TaskRequest).all()
         
+        agent_counts = Counter(a.status for a in agents)
+        task_counts = Counter(t.status for t in tasks)
+        
         return {
             'total_agents': len(agents),
-            'active_agents': len([a for a in agents if a.status in ['idle', 'busy']]),
-            'idle_agents': len([a for a in agents if a.status == 'idle']),
-            'busy_agents': len([a for a in agents if a.status == 'busy']),
-            'failed_agents': len([a for a in agents if a.status == 'failed']),
-            'pending_tasks': len([t for t in tasks if t.status == 'pending']),
-            'processing_tasks': len([t for t in tasks if t.status == 'processing']),
-            'completed_tasks': len([t for t in tasks if t.status == 'completed']),
-            'failed_tasks': len([t for t in tasks if t.status == 'failed']),
+            'active_agents': agent_counts['idle'] + agent_counts['busy'],
+            'idle_agents': agent_counts['idle'],
+            'busy_agents': agent_counts['busy'],
+            'failed_agents': agent_counts['failed'],
+            'pending_tasks': task_counts['pending'],
+            'processing_tasks': task_counts['processing'],
+            'completed_tasks': task_counts['completed'],
+            'failed_tasks': task_counts['failed'],
             'uptime': str(datetime.now() - self.start_time),
             'is_running': self.running
         }
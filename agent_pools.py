@@ -5,6 +5,7 @@ Healthcare, Financial, Sports, Business, and General purpose agents
 
 import logging
 import json
+import threading
 from typing import Dict, List, Any
 from datetime import datetime
 import re
@@ -277,3 +278,19 @@ class SpecializedAgentPools:
                 'integrations': ['AI Providers']
             }
         }
+
+# Shared instance: the pools hold no per-request state, and building
+# them constructs four domain managers, so callers on the task hot
+# path reuse one instance instead of rebuilding the object graph
+_pools_instance = None
+_pools_lock = threading.Lock()
+
+def get_specialized_pools() -> SpecializedAgentPools:
+    """Return the shared SpecializedAgentPools instance"""
+    global _pools_instance
+    if _pools_instance is None:
+        with _pools_lock:
+            if _pools_instance is None:
+                from ai_providers import get_ai_provider_manager
+                _pools_instance = SpecializedAgentPools(get_ai_provider_manager())
+    return _pools_instance
@@ -5,7 +5,10 @@ Supports OpenAI, Anthropic, and other AI providers with intelligent routing
 
 import os
 import json
+import hashlib
 import logging
+import threading
+from concurrent.futures import Future
 from typing import Dict, List, Optional, Any
 from openai import OpenAI
 import anthropic
@@ -19,6 +22,12 @@ class AIProviderManager:
     def __init__(self):
         self.providers = {}
         self.usage_stats = {}
+
+        # In-flight coalescing: identical completion requests issued
+        # concurrently share a single provider call instead of each
+        # paying full LLM latency and token cost
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
         
         # Initialize OpenAI
         openai_key = os.environ.get('OPENAI_API_KEY')
@@ -42,11 +51,48 @@ class AIProviderManager:
             'anthropic': 'claude-sonnet-4-20250514'
         }
     
-    def get_completion(self, prompt: str, provider: str = 'auto', 
+    def get_completion(self, prompt: str, provider: str = 'auto',
                       model: str = None, system_prompt: str = None,
                       max_tokens: int = 1000, temperature: float = 0.7) -> str:
-        """Get completion from specified AI provider"""
-        
+        """Get completion from specified AI provider.
+
+        Concurrent callers with byte-identical arguments are coalesced
+        onto one provider request; the extras block on the first
+        caller's result.
+        """
+        key = hashlib.sha256(repr(
+            (prompt, provider, model, system_prompt, max_tokens, temperature)
+        ).encode()).hexdigest()
+
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            if pending is not None:
+                leader = False
+            else:
+                pending = Future()
+                self._inflight[key] = pending
+                leader = True
+
+        if not leader:
+            return pending.result()
+
+        try:
+            result = self._get_completion_impl(
+                prompt, provider, model, system_prompt, max_tokens, temperature
+            )
+            pending.set_result(result)
+            return result
+        except Exception as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _get_completion_impl(self, prompt: str, provider: str,
+                            model: str, system_prompt: str,
+                            max_tokens: int, temperature: float) -> str:
+        """Resolve the provider and perform a single completion call"""
         if provider == 'auto':
             provider = self._select_optimal_provider(prompt)
         
@@ -112,18 +158,19 @@ class AIProviderManager:
                                  system_prompt: str, max_tokens: int,
                                  temperature: float) -> str:
         """Get completion from Anthropic"""
-        full_prompt = prompt
+        # Pass the system prompt through the dedicated parameter so the
+        # invariant prefix stays byte-identical across calls and the
+        # provider can reuse its cached encoding of it
+        kwargs = {
+            'model': model,
+            'max_tokens': max_tokens,
+            'temperature': temperature,
+            'messages': [{"role": "user", "content": prompt}]
+        }
         if system_prompt:
-            full_prompt = f"{system_prompt}\n\nHuman: {prompt}\n\nAssistant:"
-        else:
-            full_prompt = f"Human: {prompt}\n\nAssistant:"
-        
-        response = self.providers['anthropic'].messages.create(
-            model=model,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            messages=[{"role": "user", "content": full_prompt}]
-        )
+            kwargs['system'] = system_prompt
+
+        response = self.providers['anthropic'].messages.create(**kwargs)
         
         self.usage_stats['anthropic']['requests'] += 1
         if hasattr(response, 'usage'):
@@ -159,6 +206,120 @@ class AIProviderManager:
         else:
             raise ValueError("No AI providers available")
     
+    def stream_completion(self, prompt: str, provider: str = 'auto',
+                         model: str = None, system_prompt: str = None,
+                         max_tokens: int = 1000, temperature: float = 0.7):
+        """Stream completion text chunks as the provider generates them"""
+        if provider == 'auto':
+            provider = self._select_optimal_provider(prompt)
+
+        if provider not in self.providers:
+            raise ValueError(f"Provider '{provider}' not available")
+
+        if model is None:
+            model = self.default_models.get(provider)
+
+        if provider == 'openai':
+            return self._stream_openai_completion(
+                prompt, model, system_prompt, max_tokens, temperature
+            )
+        elif provider == 'anthropic':
+            return self._stream_anthropic_completion(
+                prompt, model, system_prompt, max_tokens, temperature
+            )
+        else:
+            raise ValueError(f"Unknown provider: {provider}")
+
+    def _stream_openai_completion(self, prompt: str, model: str,
+                                 system_prompt: str, max_tokens: int,
+                                 temperature: float):
+        """Yield content deltas from a streaming OpenAI completion"""
+        messages = []
+
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+
+        messages.append({"role": "user", "content": prompt})
+
+        stream = self.providers['openai'].chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True
+        )
+
+        self.usage_stats['openai']['requests'] += 1
+
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
+    def _stream_anthropic_completion(self, prompt: str, model: str,
+                                    system_prompt: str, max_tokens: int,
+                                    temperature: float):
+        """Yield content deltas from a streaming Anthropic completion"""
+        kwargs = {
+            'model': model,
+            'max_tokens': max_tokens,
+            'temperature': temperature,
+            'messages': [{"role": "user", "content": prompt}]
+        }
+        if system_prompt:
+            kwargs['system'] = system_prompt
+
+        self.usage_stats['anthropic']['requests'] += 1
+
+        with self.providers['anthropic'].messages.stream(**kwargs) as stream:
+            for text in stream.text_stream:
+                yield text
+
+    def batch_get_completion(self, prompts: List[str], provider: str = 'auto',
+                            system_prompt: str = None, max_tokens: int = 4000,
+                            temperature: float = 0.7) -> List[str]:
+        """Answer several independent prompts with a single provider call"""
+        if not prompts:
+            return []
+        if len(prompts) == 1:
+            return [self.get_completion(prompts[0], provider=provider,
+                                       system_prompt=system_prompt,
+                                       max_tokens=max_tokens,
+                                       temperature=temperature)]
+
+        batch_system = (f"{system_prompt}\n\n" if system_prompt else "") + (
+            f"You will be given {len(prompts)} independent queries. "
+            f"Return a JSON array of exactly {len(prompts)} string answers, "
+            "one per query, in the same order. Respond with JSON only."
+        )
+
+        numbered = "\n\n".join(
+            f"Query {i + 1}:\n{prompt}" for i, prompt in enumerate(prompts)
+        )
+
+        response = self.get_completion(
+            numbered,
+            provider=provider,
+            system_prompt=batch_system,
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+
+        try:
+            answers = json.loads(response)
+            if isinstance(answers, list) and len(answers) == len(prompts):
+                return [str(answer) for answer in answers]
+        except json.JSONDecodeError:
+            pass
+
+        # Batch reply was unusable - fall back to one call per prompt
+        logger.warning("Batch completion did not return a valid JSON array, falling back to per-prompt calls")
+        return [
+            self.get_completion(p, provider=provider, system_prompt=system_prompt,
+                               max_tokens=max_tokens, temperature=temperature)
+            for p in prompts
+        ]
+
     def get_structured_response(self, prompt: str, schema: Dict,
                                provider: str = 'auto') -> Dict:
         """Get structured response from AI provider"""
@@ -222,5 +383,20 @@ class AIProviderManager:
             except Exception as e:
                 logger.error(f"Health check failed for {provider_name}: {e}")
                 health[provider_name] = False
-        
+
         return health
+
+# Shared instance - the SDK clients keep persistent HTTP connection
+# pools, so constructing a manager per request would pay TCP+TLS
+# setup on every call and defeat in-flight coalescing
+_provider_manager = None
+_provider_manager_lock = threading.Lock()
+
+def get_ai_provider_manager() -> AIProviderManager:
+    """Get the shared AIProviderManager instance"""
+    global _provider_manager
+    if _provider_manager is None:
+        with _provider_manager_lock:
+            if _provider_manager is None:
+                _provider_manager = AIProviderManager()
+    return _provider_manager
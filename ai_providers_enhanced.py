@@ -19,6 +19,8 @@ from openai import OpenAI
 # If the user doesn't specify a model, always prefer using "claude-sonnet-4-20250514" as it is the latest model.
 from anthropic import Anthropic
 
+from sqlalchemy import update
+
 from app import db
 from models import AssistantThread, AssistantRun, AssistantConfiguration
 
@@ -439,7 +441,12 @@ Capabilities:
                     thread_record.message_count += 1
                     
                     db.session.commit()
-                    
+
+                    self._record_run_result(
+                        domain, True, time.time() - start_time,
+                        run_record.usage_tokens or 0
+                    )
+
                     return {
                         'content': response_content,
                         'provider': 'openai',
@@ -456,7 +463,10 @@ Capabilities:
             run_record.error_code = run.last_error.code if run.last_error else 'unknown'
             run_record.error_message = run.last_error.message if run.last_error else 'Unknown error'
             db.session.commit()
-            
+
+            self._record_run_result(domain, False, time.time() - start_time,
+                                   run_record.usage_tokens or 0)
+
             # Fall back to chat completion
             logger.warning(f"Assistant run failed, falling back to chat completion: {run.status}")
             return self._get_chat_completion(prompt, 'openai')
@@ -700,6 +710,35 @@ Capabilities:
             logger.error(f"Error during thread cleanup: {e}")
             db.session.rollback()
     
+    def _record_run_result(self, domain: str, success: bool,
+                          response_seconds: float, tokens: int = 0):
+        """Update the per-domain run counters with one atomic SQL statement.
+
+        All arithmetic (including the running average) happens inside
+        the UPDATE, so concurrent workers never do a read-modify-write
+        cycle that would hold the row lock across Python code.
+        """
+        try:
+            cfg = AssistantConfiguration
+            db.session.execute(
+                update(cfg)
+                .where(cfg.domain == domain)
+                .values(
+                    total_runs=cfg.total_runs + 1,
+                    successful_runs=cfg.successful_runs + (1 if success else 0),
+                    failed_runs=cfg.failed_runs + (0 if success else 1),
+                    total_tokens_used=cfg.total_tokens_used + tokens,
+                    avg_response_time=(
+                        (cfg.avg_response_time * cfg.total_runs + response_seconds)
+                        / (cfg.total_runs + 1)
+                    ),
+                )
+            )
+            db.session.commit()
+        except Exception as e:
+            logger.error(f"Error recording run result for {domain}: {e}")
+            db.session.rollback()
+
     def get_usage_stats(self) -> Dict[str, Any]:
         """Get comprehensive usage statistics"""
         
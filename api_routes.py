@@ -2,11 +2,12 @@
 API routes for external integrations and programmatic access
 """
 
-from flask import request, jsonify
+from flask import request, jsonify, Response
 from app import app, db
 from models import TaskRequest, AgentInstance, SystemMetrics
-from agent_master_controller import master_controller
+from agent_master_controller import get_master_controller
 import logging
+from collections import Counter
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
@@ -23,13 +24,14 @@ def require_api_key():
 def api_health():
     """API health check endpoint"""
     try:
-        # Check database connectivity
+        # Check database connectivity on a pooled connection; a plain SELECT
+        # needs no transaction commit round-trip
         from sqlalchemy import text
-        db.session.execute(text('SELECT 1'))
-        db.session.commit()
-        
+        with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            conn.execute(text('SELECT 1'))
+
         # Get system status
-        system_status = master_controller.get_system_status()
+        system_status = get_master_controller().get_system_status()
         
         return jsonify({
             'status': 'healthy',
@@ -69,7 +71,7 @@ def api_submit_task():
             return jsonify({'error': 'Priority must be an integer between 1 and 10'}), 400
         
         # Submit task
-        task_id = master_controller.submit_task(
+        task_id = get_master_controller().submit_task(
             query=query,
             user_id=user_id,
             priority=priority,
@@ -211,8 +213,13 @@ def api_get_pool_agents(pool_name):
         return jsonify({'error': 'Invalid pool name'}), 400
     
     agents = AgentInstance.query.filter_by(pool_name=pool_name).all()
-    
+
+    # Build the agent list and accumulate pool statistics in a single pass
+    # instead of re-scanning the agent list per statistic
     agent_list = []
+    status_counts = Counter()
+    success_rate_sum = 0.0
+    response_time_sum = 0.0
     for agent in agents:
         agent_data = {
             'agent_id': agent.instance_id,
@@ -225,16 +232,20 @@ def api_get_pool_agents(pool_name):
             'last_health_check': agent.last_health_check.isoformat() if agent.last_health_check else None
         }
         agent_list.append(agent_data)
-    
+        status_counts[agent.status] += 1
+        success_rate_sum += agent.success_rate
+        response_time_sum += agent.avg_response_time
+
     # Pool statistics
+    total_agents = len(agents)
     pool_stats = {
-        'total_agents': len(agents),
-        'active_agents': len([a for a in agents if a.status in ['idle', 'busy']]),
-        'idle_agents': len([a for a in agents if a.status == 'idle']),
-        'busy_agents': len([a for a in agents if a.status == 'busy']),
-        'failed_agents': len([a for a in agents if a.status == 'failed']),
-        'avg_success_rate': sum(a.success_rate for a in agents) / len(agents) if agents else 0,
-        'avg_response_time': sum(a.avg_response_time for a in agents) / len(agents) if agents else 0
+        'total_agents': total_agents,
+        'active_agents': status_counts['idle'] + status_counts['busy'],
+        'idle_agents': status_counts['idle'],
+        'busy_agents': status_counts['busy'],
+        'failed_agents': status_counts['failed'],
+        'avg_success_rate': success_rate_sum / total_agents if total_agents else 0,
+        'avg_response_time': response_time_sum / total_agents if total_agents else 0
     }
     
     return jsonify({
@@ -258,7 +269,7 @@ def api_get_metrics():
     ).order_by(SystemMetrics.timestamp.desc()).all()
     
     # Current system status
-    system_status = master_controller.get_system_status()
+    system_status = get_master_controller().get_system_status()
     
     # Format metrics
     metrics_data = []
@@ -283,27 +294,28 @@ def api_get_metrics():
         'timeframe_hours': hours_back
     })
 
-@app.route('/api/v1/capabilities')
-def api_get_capabilities():
-    """Get available agent capabilities"""
-    if not require_api_key():
-        return jsonify({'error': 'Invalid API key'}), 401
-    
+# Pre-serialized capabilities payload - the content only changes when the
+# provider configuration changes, so serialize once and serve raw bytes
+_capabilities_json = None
+
+def _build_capabilities_json() -> bytes:
+    """Build and serialize the capabilities payload"""
+    import json
     from agent_pools import SpecializedAgentPools
-    from ai_providers import AIProviderManager
-    
-    ai_provider = AIProviderManager()
+    from ai_providers import get_ai_provider_manager
+
+    ai_provider = get_ai_provider_manager()
     specialized_pools = SpecializedAgentPools(ai_provider)
-    
+
     capabilities = {}
     for pool_name in ['healthcare', 'financial', 'sports', 'business', 'general']:
         capabilities[pool_name] = specialized_pools.get_pool_capabilities(pool_name)
-    
+
     # Get available AI providers
     available_providers = ai_provider.get_available_providers()
     provider_health = ai_provider.health_check()
-    
-    return jsonify({
+
+    return json.dumps({
         'agent_pools': capabilities,
         'ai_providers': {
             'available': available_providers,
@@ -317,7 +329,24 @@ def api_get_capabilities():
             'conversation_context',
             'priority_queuing'
         ]
-    })
+    }).encode('utf-8')
+
+def invalidate_capabilities_cache():
+    """Force a rebuild of the capabilities payload on next request"""
+    global _capabilities_json
+    _capabilities_json = None
+
+@app.route('/api/v1/capabilities')
+def api_get_capabilities():
+    """Get available agent capabilities"""
+    if not require_api_key():
+        return jsonify({'error': 'Invalid API key'}), 401
+
+    global _capabilities_json
+    if _capabilities_json is None:
+        _capabilities_json = _build_capabilities_json()
+
+    return Response(_capabilities_json, mimetype='application/json')
 
 @app.route('/api/v1/system/status')
 def api_system_status():
@@ -327,17 +356,17 @@ def api_system_status():
     
     try:
         # Get master controller status
-        controller_status = master_controller.get_system_status()
+        controller_status = get_master_controller().get_system_status()
         
-        # Get database status
+        # Get database status (read-only probe, no commit needed)
         from sqlalchemy import text
-        db.session.execute(text('SELECT 1'))
-        db.session.commit()
+        with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            conn.execute(text('SELECT 1'))
         db_status = 'healthy'
         
         # Get AI provider status
-        from ai_providers import AIProviderManager
-        ai_manager = AIProviderManager()
+        from ai_providers import get_ai_provider_manager
+        ai_manager = get_ai_provider_manager()
         provider_health = ai_manager.health_check()
         
         # Get recent performance metrics
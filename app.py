@@ -18,13 +18,16 @@ app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET")
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 
-# Configure the database
+# Configure the database. The pool is sized to the task processor's
+# worker count (20) so concurrent workers don't serialize on
+# connection checkout; overflow absorbs web requests on top.
 app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL")
 app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-    "pool_recycle": 300,
+    "pool_recycle": 1800,
     "pool_pre_ping": True,
-    "pool_size": 10,
-    "max_overflow": 20
+    "pool_size": 20,
+    "max_overflow": 20,
+    "pool_timeout": 30
 }
 
 # Production security settings
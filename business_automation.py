@@ -3,16 +3,226 @@ Business Automation Manager - Enterprise workflow optimization and automation to
 Process automation, workflow design, and business intelligence
 """
 
+import asyncio
+import concurrent.futures
+import functools
 import logging
 import json
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from types import MappingProxyType
 from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+_DISALLOWED_RE = re.compile(
+    r'\b(?:password|credit card number|ssn|social security number)\b',
+    re.IGNORECASE
+)
+
+def _tokenize(text: str) -> frozenset:
+    """Lowercased word tokens for near-duplicate query matching"""
+    return frozenset(_TOKEN_RE.findall(text.lower()))
+
+@functools.lru_cache(maxsize=128)
+def _dumps_frozen(frozen_kv: tuple) -> str:
+    """Serialize a flattened state dict once per distinct content"""
+    return json.dumps(dict(frozen_kv), indent=2)
+
+def _llm_safe(error_msg: str):
+    """Log failures from an LLM-backed method and return a friendly message"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                logger.error("Error in %s: %s", fn.__name__, e)
+                return error_msg
+        return wrapper
+    return decorator
+
+class _DiskCache:
+    """Small sqlite3-backed response cache shared across processes
+
+    Sits under the in-memory LRU so repeat queries survive restarts of
+    short-lived workers. Entries expire after a TTL.
+    """
+
+    def __init__(self, path: str, ttl: int = 7 * 86400):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT, expires REAL)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires = row
+            if expires < time.time():
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return value
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires) "
+                "VALUES (?, ?, ?)",
+                (key, value, time.time() + self.ttl)
+            )
+            self._conn.commit()
+
+def _dumps_state(state: Dict) -> str:
+    """json.dumps(..., indent=2) memoized for hashable state dicts"""
+    try:
+        return _dumps_frozen(tuple(sorted(state.items())))
+    except TypeError:
+        # Unhashable or mixed-key dicts cannot be used as a cache key
+        return json.dumps(state, indent=2, default=str)
+
+# Prompt templates for the six analysis methods. Only {query} varies per
+# call, so the bodies are built once at import: (template, system prompt,
+# temperature).
+_PROMPTS = {
+    'process_automation': (
+        "Design process automation solutions for this business request.\n"
+        "Query: {query}\n"
+        "Cover: 1.Process analysis: current-state mapping; pain points; "
+        "bottlenecks; root causes; resource utilization. "
+        "2.Automation opportunities: tasks to automate; tools; integration "
+        "needs; data flow; decision-point automation. "
+        "3.Solution design: recommended tools; architecture; system "
+        "integration; UI requirements; security and compliance. "
+        "4.Implementation roadmap: phases; resources; timeline and "
+        "milestones; risk mitigation; change management. "
+        "5.ROI analysis: cost-benefit; productivity gains; error reduction; "
+        "time savings; payback period. "
+        "6.Monitoring and optimization: KPIs; performance monitoring; "
+        "continuous improvement; feedback loops. "
+        "Give actionable, technology-agnostic recommendations implementable "
+        "in phases.",
+        "You are a business process automation expert with deep knowledge of workflow optimization, technology solutions, and change management. Focus on practical, implementable solutions.",
+        0.3
+    ),
+    'workflow_optimization': (
+        "Optimize the workflow described in this request.\n"
+        "Query: {query}\n"
+        "Cover: 1.Current workflow analysis: step breakdown; time and "
+        "motion; resource allocation; handoffs; communication flow. "
+        "2.Optimization opportunities: redundant steps; parallelization; "
+        "approval streamlining; communication; resource reallocation. "
+        "3.Lean application: value stream mapping; 7 wastes; pull systems; "
+        "continuous flow; standardization. "
+        "4.Technology enablement: digital transformation; automation tools; "
+        "collaboration platforms; mobile; cloud. "
+        "5.Performance improvement: cycle time; quality; error prevention; "
+        "capacity; throughput. "
+        "6.Implementation strategy: change management; training; pilot "
+        "design; rollout timeline; success measures. "
+        "Give specific, actionable recommendations with clear steps.",
+        "You are a workflow optimization specialist with expertise in Lean methodology, business process reengineering, and operational excellence.",
+        0.4
+    ),
+    'project_management': (
+        "Provide project management guidance for this request.\n"
+        "Query: {query}\n"
+        "Cover: 1.Planning: scope and requirements; WBS; timeline and "
+        "milestones; resources and scheduling; risks. "
+        "2.Methodology: Agile vs Waterfall; hybrid options; Scrum/Kanban; "
+        "complexity; team structure. "
+        "3.Execution: task management; progress tracking; communication "
+        "plan; QA; change control. "
+        "4.Team coordination: RACI; meeting cadence; collaboration tools; "
+        "performance management; conflict resolution. "
+        "5.Monitoring and control: KPIs; dashboards; earned value; issue "
+        "tracking; stakeholder management. "
+        "6.Closure: acceptance criteria; lessons learned; knowledge "
+        "transfer; post-project evaluation; recognition.",
+        "You are a certified project management professional (PMP) with expertise in various methodologies including Agile, Scrum, and traditional project management.",
+        0.4
+    ),
+    'strategic_planning': (
+        "Provide strategic planning guidance for this business request.\n"
+        "Query: {query}\n"
+        "Cover: 1.Situation analysis: SWOT; market trends; competitive "
+        "landscape; internal capabilities; stakeholders. "
+        "2.Strategic framework: vision/mission alignment; objectives; goal "
+        "prioritization; success metrics; value proposition. "
+        "3.Strategy formulation: option evaluation; growth strategy; market "
+        "positioning; competitive advantage; innovation. "
+        "4.Implementation planning: initiative roadmap; resource "
+        "allocation; capability building; change management; timeline. "
+        "5.Performance measurement: balanced scorecard; KPI framework; "
+        "review processes; feedback mechanisms; dashboards. "
+        "6.Risk management: strategic risks; scenario planning; "
+        "mitigation; crisis preparation; adaptive frameworks. "
+        "Give evidence-based recommendations with clear implementation "
+        "guidance.",
+        "You are a strategic planning consultant with expertise in business strategy, market analysis, and organizational development.",
+        0.4
+    ),
+    'operations_analysis': (
+        "Analyze and optimize operations for this request.\n"
+        "Query: {query}\n"
+        "Cover: 1.Operational efficiency: process efficiency; resource "
+        "utilization; capacity planning; bottlenecks; cost reduction. "
+        "2.Quality management: quality control; defect prevention; "
+        "customer satisfaction; service levels; continuous improvement. "
+        "3.Supply chain: vendor management; inventory; logistics; "
+        "procurement; risk management. "
+        "4.Performance analytics: KPI framework; data collection; "
+        "predictive analytics; real-time monitoring; benchmarking. "
+        "5.Technology integration: technology assessment; digital "
+        "transformation; automation and AI; system integration; ROI. "
+        "6.Organizational effectiveness: team structure; skill gaps and "
+        "training; communication; culture; leadership development. "
+        "Focus on measurable improvements and sustainable operational "
+        "excellence.",
+        "You are an operations management expert with experience in operational excellence, Lean Six Sigma, and business process optimization.",
+        0.3
+    ),
+    'general_business_advice': (
+        "Provide practical business guidance for this request.\n"
+        "Query: {query}\n"
+        "Cover relevant aspects: strategy and planning; operational "
+        "improvement; market analysis and positioning; financial planning; "
+        "organizational development; technology and innovation; risk and "
+        "compliance; growth and scaling. "
+        "Ensure recommendations are actionable, evidence-based, and "
+        "tailored to the specific context.",
+        "You are a experienced business consultant with broad expertise across multiple industries and business functions.",
+        0.5
+    ),
+}
+
 class BusinessAutomationManager:
     """Enterprise business automation and workflow optimization"""
-    
+
+    # Shared worker pool so web handlers can run LLM calls off the request
+    # thread instead of blocking a Gunicorn worker for the full round-trip
+    _pool = concurrent.futures.ThreadPoolExecutor(
+        max_workers=int(os.environ.get('LLM_POOL', '16')),
+        thread_name_prefix='llm'
+    )
+
     def __init__(self, ai_provider_manager):
         self.ai_provider = ai_provider_manager
         
@@ -24,384 +234,358 @@ class BusinessAutomationManager:
             'change_management': ['Kotter', 'ADKAR', 'Lean Change', 'Agile Change']
         }
         
+        # Exact-match LRU cache for LLM responses - repeat queries skip the
+        # provider round-trip entirely
+        self._cache = OrderedDict()
+        self._cache_max = 512
+
+        # Near-miss cache: most repeat traffic is paraphrases ("automate
+        # invoice approval" vs "automate our AP invoicing") that never hit
+        # the exact-match LRU, so close-enough queries are matched on token
+        # overlap within the same method namespace
+        self._near_cache = deque(maxlen=2048)
+        self._near_threshold = 0.8
+
+        # Disk layer under the LRU; disabled gracefully if the path is
+        # not writable
+        try:
+            self._disk = _DiskCache(
+                os.environ.get('BIZ_AUTO_CACHE', '/tmp/biz_auto_cache.db')
+            )
+        except Exception as e:
+            logger.warning("Disk response cache unavailable: %s", e)
+            self._disk = None
+
+        # Built once and shared read-only - this is polled by dashboards,
+        # so rebuilding the nested literal per call is pure allocation churn
+        self._templates = MappingProxyType({
+            'process_mapping': {
+                'swimlane_diagram': 'Visual process flow with responsibilities',
+                'value_stream_map': 'End-to-end process with value-add analysis',
+                'flowchart': 'Decision-based process visualization',
+                'sops': 'Standard Operating Procedures documentation'
+            },
+            'automation_tools': {
+                'rpa': ['UiPath', 'Automation Anywhere', 'Blue Prism'],
+                'workflow': ['Microsoft Power Automate', 'Zapier', 'Nintex'],
+                'bpm': ['Pega', 'Appian', 'IBM BPM'],
+                'ai_ml': ['TensorFlow', 'Azure ML', 'Amazon SageMaker']
+            },
+            'frameworks': MappingProxyType(self.automation_frameworks),
+            'methodologies': {
+                'lean': 'Waste elimination and value creation',
+                'six_sigma': 'Data-driven process improvement',
+                'agile': 'Iterative development and continuous feedback',
+                'design_thinking': 'Human-centered problem solving'
+            }
+        })
+
         logger.info("Business Automation Manager initialized")
-    
-    def process_automation(self, query: str) -> str:
-        """Analyze and design process automation solutions"""
+
+    def _prefilter(self, query: str) -> Optional[str]:
+        """Return a canned reply for queries not worth an LLM round-trip"""
+        stripped = query.strip() if query else ''
+        if len(stripped) < 8:
+            return ("Could you describe your business question in a bit more "
+                    "detail? A sentence or two about the process or goal "
+                    "helps me give a useful answer.")
+        if stripped.count('\n') > 200:
+            return ("That request is too large to analyze in one pass. "
+                    "Please narrow it down to a single process or question.")
+        if _DISALLOWED_RE.search(stripped):
+            return ("I can't help with requests involving credentials or "
+                    "personal identifiers. Please rephrase your business "
+                    "question without the sensitive details.")
+        return None
+
+    def _find_near_match(self, tag: str, query_tokens: frozenset) -> Optional[str]:
+        """Find a cached response for a close paraphrase of this query"""
+        best_score = 0.0
+        best_response = None
+
+        for entry_tag, tokens, value in self._near_cache:
+            if entry_tag != tag:
+                continue
+            overlap = len(query_tokens & tokens)
+            if not overlap:
+                continue
+            score = overlap / len(query_tokens | tokens)
+            if score > best_score:
+                best_score = score
+                best_response = value
+
+        if best_score >= self._near_threshold:
+            return best_response
+        return None
+
+    def _cached_completion(self, tag: str, prompt: str, system_prompt: str,
+                          temperature: float, query: Optional[str] = None) -> str:
+        """Get a completion, serving repeat (method, query) pairs from cache"""
+        key = hashlib.sha256(
+            f"{tag}|{system_prompt}|{temperature}|{prompt}".encode()
+        ).hexdigest()
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        if self._disk is not None:
+            stored = self._disk.get(key)
+            if stored is not None:
+                self._cache[key] = stored
+                if len(self._cache) > self._cache_max:
+                    self._cache.popitem(last=False)
+                return stored
+
+        query_tokens = _tokenize(query) if query else None
+        if query_tokens:
+            near = self._find_near_match(tag, query_tokens)
+            if near is not None:
+                self._cache[key] = near
+                if len(self._cache) > self._cache_max:
+                    self._cache.popitem(last=False)
+                return near
+
+        response = self.ai_provider.get_completion(
+            prompt,
+            system_prompt=system_prompt,
+            temperature=temperature
+        )
+
+        self._cache[key] = response
+        if len(self._cache) > self._cache_max:
+            self._cache.popitem(last=False)
+
+        if self._disk is not None:
+            try:
+                self._disk.set(key, response)
+            except Exception as e:
+                logger.warning("Failed to persist response to disk cache: %s", e)
+
+        if query_tokens:
+            self._near_cache.append((tag, query_tokens, response))
+
+        return response
+
+    async def _acompletion(self, tag: str, query: str) -> str:
+        """Run one analysis in a worker thread without blocking the loop"""
+        template, system_prompt, temperature = _PROMPTS[tag]
         try:
-            automation_prompt = f"""
-            Design comprehensive process automation solutions based on the following business request:
-            
-            Query: {query}
-            
-            Please provide detailed automation analysis including:
-            
-            1. PROCESS ANALYSIS:
-            - Current state process mapping
-            - Pain point identification
-            - Bottleneck analysis
-            - Inefficiency root causes
-            - Resource utilization assessment
-            
-            2. AUTOMATION OPPORTUNITIES:
-            - Tasks suitable for automation
-            - Technology solutions and tools
-            - Integration requirements
-            - Data flow optimization
-            - Decision point automation
-            
-            3. SOLUTION DESIGN:
-            - Recommended automation tools
-            - Implementation architecture
-            - System integration approach
-            - User interface requirements
-            - Security and compliance considerations
-            
-            4. IMPLEMENTATION ROADMAP:
-            - Phase-by-phase implementation plan
-            - Resource requirements
-            - Timeline and milestones
-            - Risk mitigation strategies
-            - Change management approach
-            
-            5. ROI ANALYSIS:
-            - Cost-benefit analysis
-            - Productivity gains estimation
-            - Error reduction quantification
-            - Time savings calculations
-            - Payback period assessment
-            
-            6. MONITORING & OPTIMIZATION:
-            - KPIs and success metrics
-            - Performance monitoring setup
-            - Continuous improvement process
-            - Feedback loops and adjustments
-            
-            Provide actionable, technology-agnostic recommendations that can be implemented in phases.
-            """
-            
-            response = self.ai_provider.get_completion(
-                automation_prompt,
-                system_prompt="You are a business process automation expert with deep knowledge of workflow optimization, technology solutions, and change management. Focus on practical, implementable solutions.",
-                temperature=0.3
+            return await asyncio.to_thread(
+                self._cached_completion,
+                tag,
+                template.replace('{query}', query),
+                system_prompt,
+                temperature,
+                query
             )
-            
-            return response
-            
         except Exception as e:
-            logger.error(f"Error in process automation analysis: {e}")
-            return "I apologize, but I encountered an error while analyzing process automation opportunities. Please provide more specific details about your business processes."
-    
-    def workflow_optimization(self, query: str) -> str:
-        """Optimize business workflows and procedures"""
+            logger.error("Error in async %s analysis: %s", tag, e)
+            return "I apologize, but I encountered an error while completing this analysis."
+
+    async def process_automation_async(self, query: str) -> str:
+        """Async variant of process_automation"""
+        return await self._acompletion('process_automation', query)
+
+    async def workflow_optimization_async(self, query: str) -> str:
+        """Async variant of workflow_optimization"""
+        return await self._acompletion('workflow_optimization', query)
+
+    async def project_management_async(self, query: str) -> str:
+        """Async variant of project_management"""
+        return await self._acompletion('project_management', query)
+
+    async def strategic_planning_async(self, query: str) -> str:
+        """Async variant of strategic_planning"""
+        return await self._acompletion('strategic_planning', query)
+
+    async def operations_analysis_async(self, query: str) -> str:
+        """Async variant of operations_analysis"""
+        return await self._acompletion('operations_analysis', query)
+
+    async def general_business_advice_async(self, query: str) -> str:
+        """Async variant of general_business_advice"""
+        return await self._acompletion('general_business_advice', query)
+
+    async def run_all_async(self, query: str) -> Dict[str, str]:
+        """Run all six analyses concurrently for one query"""
+        tags = tuple(_PROMPTS)
+        results = await asyncio.gather(*(self._acompletion(tag, query) for tag in tags))
+        return dict(zip(tags, results))
+
+    def run_all(self, query: str) -> Dict[str, str]:
+        """Synchronous wrapper around run_all_async"""
+        return asyncio.run(self.run_all_async(query))
+
+    def submit(self, method: str, query: str) -> concurrent.futures.Future:
+        """Run an analysis method on the shared pool, returning a Future
+
+        Callers can wait with a timeout and release their thread while the
+        LLM call is still in flight.
+        """
+        return self._pool.submit(getattr(self, method), query)
+
+    def close(self):
+        """Shut down the shared LLM pool, waiting for in-flight calls"""
+        self._pool.shutdown(wait=True)
+
+    def batch_analysis(self, tag: str, queries: List[str]) -> List[str]:
+        """Answer many queries for one analysis method in a single LLM call"""
+        template, system_prompt, temperature = _PROMPTS[tag]
         try:
-            workflow_prompt = f"""
-            Provide comprehensive workflow optimization recommendations based on the following request:
-            
-            Query: {query}
-            
-            Please analyze and optimize the workflow considering:
-            
-            1. CURRENT WORKFLOW ANALYSIS:
-            - Step-by-step process breakdown
-            - Time and motion analysis
-            - Resource allocation review
-            - Handoff point identification
-            - Communication flow mapping
-            
-            2. OPTIMIZATION OPPORTUNITIES:
-            - Redundant step elimination
-            - Parallel processing possibilities
-            - Approval process streamlining
-            - Communication enhancement
-            - Resource reallocation
-            
-            3. LEAN METHODOLOGY APPLICATION:
-            - Value stream mapping
-            - Waste identification (7 types of waste)
-            - Pull system implementation
-            - Continuous flow design
-            - Standardization opportunities
-            
-            4. TECHNOLOGY ENABLEMENT:
-            - Digital transformation opportunities
-            - Automation tool recommendations
-            - Collaboration platform integration
-            - Mobile accessibility improvements
-            - Cloud-based solutions
-            
-            5. PERFORMANCE IMPROVEMENT:
-            - Cycle time reduction strategies
-            - Quality improvement measures
-            - Error prevention mechanisms
-            - Capacity optimization
-            - Throughput enhancement
-            
-            6. IMPLEMENTATION STRATEGY:
-            - Change management approach
-            - Training and development needs
-            - Pilot program design
-            - Rollout timeline
-            - Success measurement framework
-            
-            Provide specific, actionable recommendations with clear implementation steps.
-            """
-            
-            response = self.ai_provider.get_completion(
-                workflow_prompt,
-                system_prompt="You are a workflow optimization specialist with expertise in Lean methodology, business process reengineering, and operational excellence.",
-                temperature=0.4
+            prompts = [template.replace('{query}', query) for query in queries]
+            return self.ai_provider.batch_get_completion(
+                prompts,
+                system_prompt=system_prompt,
+                temperature=temperature
             )
-            
-            return response
-            
         except Exception as e:
-            logger.error(f"Error in workflow optimization: {e}")
-            return "I apologize, but I encountered an error while optimizing workflow processes."
+            logger.error("Error in batch %s analysis: %s", tag, e)
+            return ["I apologize, but I encountered an error while completing this analysis."] * len(queries)
+
+    def batch_process_automation(self, queries: List[str]) -> List[str]:
+        """Batch variant of process_automation"""
+        return self.batch_analysis('process_automation', queries)
+
+    def iter_analysis(self, tag: str, query: str):
+        """Stream an analysis response chunk by chunk
+
+        Cached answers are yielded as a single chunk; otherwise chunks are
+        relayed as the provider generates them and the caches are populated
+        once the stream completes.
+        """
+        template, system_prompt, temperature = _PROMPTS[tag]
+        prompt = template.replace('{query}', query)
+
+        key = hashlib.sha256(
+            f"{tag}|{system_prompt}|{temperature}|{prompt}".encode()
+        ).hexdigest()
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            yield cached
+            return
+
+        chunks = []
+        for chunk in self.ai_provider.stream_completion(
+            prompt, system_prompt=system_prompt, temperature=temperature
+        ):
+            chunks.append(chunk)
+            yield chunk
+
+        response = ''.join(chunks)
+        self._cache[key] = response
+        if len(self._cache) > self._cache_max:
+            self._cache.popitem(last=False)
+        self._near_cache.append((tag, _tokenize(query), response))
+
+    @_llm_safe("I apologize, but I encountered an error while analyzing process automation opportunities. Please provide more specific details about your business processes.")
+    def process_automation(self, query: str) -> str:
+        """Analyze and design process automation solutions"""
+        direct = self._prefilter(query)
+        if direct:
+            return direct
+
+        template, system_prompt, temperature = _PROMPTS['process_automation']
+        return self._cached_completion(
+            'process_automation',
+            template.replace('{query}', query),
+            system_prompt=system_prompt,
+            temperature=temperature,
+            query=query
+        )
+    
+    @_llm_safe("I apologize, but I encountered an error while optimizing workflow processes.")
+    def workflow_optimization(self, query: str) -> str:
+        """Optimize business workflows and procedures"""
+        direct = self._prefilter(query)
+        if direct:
+            return direct
+
+        template, system_prompt, temperature = _PROMPTS['workflow_optimization']
+        return self._cached_completion(
+            'workflow_optimization',
+            template.replace('{query}', query),
+            system_prompt=system_prompt,
+            temperature=temperature,
+            query=query
+        )
     
+    @_llm_safe("I apologize, but I encountered an error while providing project management guidance.")
     def project_management(self, query: str) -> str:
         """Provide project management guidance and tools"""
-        try:
-            pm_prompt = f"""
-            Provide comprehensive project management guidance based on the following request:
-            
-            Query: {query}
-            
-            Please address the following project management aspects:
-            
-            1. PROJECT PLANNING:
-            - Scope definition and requirements gathering
-            - Work breakdown structure (WBS)
-            - Timeline and milestone planning
-            - Resource allocation and scheduling
-            - Risk identification and assessment
-            
-            2. METHODOLOGY SELECTION:
-            - Agile vs. Waterfall assessment
-            - Hybrid approach considerations
-            - Scrum/Kanban implementation
-            - Project complexity analysis
-            - Team structure recommendations
-            
-            3. EXECUTION FRAMEWORK:
-            - Task management and assignment
-            - Progress tracking and reporting
-            - Communication plan and protocols
-            - Quality assurance processes
-            - Change control procedures
-            
-            4. TEAM COORDINATION:
-            - Role and responsibility matrix (RACI)
-            - Meeting structure and cadence
-            - Collaboration tools and platforms
-            - Performance management
-            - Conflict resolution strategies
-            
-            5. MONITORING & CONTROL:
-            - KPIs and success metrics
-            - Dashboard and reporting design
-            - Earned value management
-            - Issue tracking and resolution
-            - Stakeholder management
-            
-            6. PROJECT CLOSURE:
-            - Deliverable acceptance criteria
-            - Lessons learned documentation
-            - Knowledge transfer process
-            - Post-project evaluation
-            - Success celebration and recognition
-            
-            Tailor recommendations to the specific project type and organizational context.
-            """
-            
-            response = self.ai_provider.get_completion(
-                pm_prompt,
-                system_prompt="You are a certified project management professional (PMP) with expertise in various methodologies including Agile, Scrum, and traditional project management.",
-                temperature=0.4
-            )
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error in project management guidance: {e}")
-            return "I apologize, but I encountered an error while providing project management guidance."
+        direct = self._prefilter(query)
+        if direct:
+            return direct
+
+        template, system_prompt, temperature = _PROMPTS['project_management']
+        return self._cached_completion(
+            'project_management',
+            template.replace('{query}', query),
+            system_prompt=system_prompt,
+            temperature=temperature,
+            query=query
+        )
     
+    @_llm_safe("I apologize, but I encountered an error while providing strategic planning guidance.")
     def strategic_planning(self, query: str) -> str:
         """Provide strategic planning and business strategy guidance"""
-        try:
-            strategy_prompt = f"""
-            Provide comprehensive strategic planning guidance based on the following business request:
-            
-            Query: {query}
-            
-            Please develop strategic recommendations covering:
-            
-            1. SITUATION ANALYSIS:
-            - SWOT analysis framework
-            - Market analysis and trends
-            - Competitive landscape assessment
-            - Internal capability evaluation
-            - Stakeholder analysis
-            
-            2. STRATEGIC FRAMEWORK:
-            - Vision and mission alignment
-            - Strategic objectives definition
-            - Goal setting and prioritization
-            - Success metrics identification
-            - Value proposition refinement
-            
-            3. STRATEGY FORMULATION:
-            - Strategic options evaluation
-            - Growth strategy recommendations
-            - Market positioning strategy
-            - Competitive advantage development
-            - Innovation and differentiation
-            
-            4. IMPLEMENTATION PLANNING:
-            - Strategic initiative roadmap
-            - Resource allocation strategy
-            - Organizational capability building
-            - Change management approach
-            - Timeline and milestone planning
-            
-            5. PERFORMANCE MEASUREMENT:
-            - Balanced scorecard development
-            - KPI framework design
-            - Monitoring and review processes
-            - Feedback and adjustment mechanisms
-            - Strategic dashboard creation
-            
-            6. RISK MANAGEMENT:
-            - Strategic risk identification
-            - Scenario planning and contingencies
-            - Risk mitigation strategies
-            - Crisis management preparation
-            - Adaptive strategy frameworks
-            
-            Provide evidence-based recommendations with clear implementation guidance.
-            """
-            
-            response = self.ai_provider.get_completion(
-                strategy_prompt,
-                system_prompt="You are a strategic planning consultant with expertise in business strategy, market analysis, and organizational development.",
-                temperature=0.4
-            )
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error in strategic planning: {e}")
-            return "I apologize, but I encountered an error while providing strategic planning guidance."
+        direct = self._prefilter(query)
+        if direct:
+            return direct
+
+        template, system_prompt, temperature = _PROMPTS['strategic_planning']
+        return self._cached_completion(
+            'strategic_planning',
+            template.replace('{query}', query),
+            system_prompt=system_prompt,
+            temperature=temperature,
+            query=query
+        )
     
+    @_llm_safe("I apologize, but I encountered an error while analyzing business operations.")
     def operations_analysis(self, query: str) -> str:
         """Analyze and optimize business operations"""
-        try:
-            operations_prompt = f"""
-            Provide comprehensive operations analysis and optimization recommendations based on the following request:
-            
-            Query: {query}
-            
-            Please analyze operations across the following dimensions:
-            
-            1. OPERATIONAL EFFICIENCY:
-            - Process efficiency analysis
-            - Resource utilization optimization
-            - Capacity planning and management
-            - Bottleneck identification and resolution
-            - Cost reduction opportunities
-            
-            2. QUALITY MANAGEMENT:
-            - Quality control systems
-            - Defect prevention strategies
-            - Customer satisfaction improvement
-            - Service level optimization
-            - Continuous improvement culture
-            
-            3. SUPPLY CHAIN OPTIMIZATION:
-            - Vendor management and relationships
-            - Inventory optimization
-            - Logistics and distribution efficiency
-            - Procurement process improvement
-            - Supply chain risk management
-            
-            4. PERFORMANCE ANALYTICS:
-            - Operational KPI framework
-            - Data collection and analysis
-            - Predictive analytics applications
-            - Real-time monitoring systems
-            - Performance benchmarking
-            
-            5. TECHNOLOGY INTEGRATION:
-            - Operations technology assessment
-            - Digital transformation opportunities
-            - Automation and AI applications
-            - System integration requirements
-            - Technology ROI evaluation
-            
-            6. ORGANIZATIONAL EFFECTIVENESS:
-            - Team structure optimization
-            - Skill gap analysis and training
-            - Communication improvement
-            - Culture and engagement enhancement
-            - Leadership development needs
-            
-            Focus on measurable improvements and sustainable operational excellence.
-            """
-            
-            response = self.ai_provider.get_completion(
-                operations_prompt,
-                system_prompt="You are an operations management expert with experience in operational excellence, Lean Six Sigma, and business process optimization.",
-                temperature=0.3
-            )
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error in operations analysis: {e}")
-            return "I apologize, but I encountered an error while analyzing business operations."
+        direct = self._prefilter(query)
+        if direct:
+            return direct
+
+        template, system_prompt, temperature = _PROMPTS['operations_analysis']
+        return self._cached_completion(
+            'operations_analysis',
+            template.replace('{query}', query),
+            system_prompt=system_prompt,
+            temperature=temperature,
+            query=query
+        )
     
+    @_llm_safe("I apologize, but I encountered an error while providing business advice.")
     def general_business_advice(self, query: str) -> str:
         """Provide general business guidance and advice"""
-        try:
-            business_prompt = f"""
-            Provide comprehensive business guidance and advice based on the following request:
-            
-            Query: {query}
-            
-            Please provide practical business advice covering relevant aspects such as:
-            - Business strategy and planning
-            - Operational improvement opportunities
-            - Market analysis and positioning
-            - Financial planning and management
-            - Organizational development
-            - Technology and innovation
-            - Risk management and compliance
-            - Growth and scaling strategies
-            
-            Ensure recommendations are actionable, evidence-based, and tailored to the specific context.
-            """
-            
-            response = self.ai_provider.get_completion(
-                business_prompt,
-                system_prompt="You are a experienced business consultant with broad expertise across multiple industries and business functions.",
-                temperature=0.5
-            )
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error in general business advice: {e}")
-            return "I apologize, but I encountered an error while providing business advice."
+        direct = self._prefilter(query)
+        if direct:
+            return direct
+
+        template, system_prompt, temperature = _PROMPTS['general_business_advice']
+        return self._cached_completion(
+            'general_business_advice',
+            template.replace('{query}', query),
+            system_prompt=system_prompt,
+            temperature=temperature,
+            query=query
+        )
     
+    @_llm_safe("Unable to generate automation report at this time.")
     def generate_automation_report(self, process_name: str, current_state: Dict, target_state: Dict) -> str:
         """Generate comprehensive automation assessment report"""
-        try:
-            report_prompt = f"""
+        report_prompt = f"""
             Generate a comprehensive business automation assessment report with the following information:
             
             Process Name: {process_name}
-            Current State: {json.dumps(current_state, indent=2)}
-            Target State: {json.dumps(target_state, indent=2)}
+            Current State: {_dumps_state(current_state)}
+            Target State: {_dumps_state(target_state)}
             
             Please create a detailed report including:
             
@@ -418,39 +602,17 @@ class BusinessAutomationManager:
             
             Format as a professional business report suitable for executive presentation.
             """
-            
-            response = self.ai_provider.get_completion(
-                report_prompt,
-                system_prompt="You are a business automation consultant creating executive-level reports on process improvement and automation opportunities.",
-                temperature=0.2
-            )
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error generating automation report: {e}")
-            return "Unable to generate automation report at this time."
+        return self._cached_completion(
+            'generate_automation_report',
+            report_prompt,
+            system_prompt="You are a business automation consultant creating executive-level reports on process improvement and automation opportunities.",
+            temperature=0.2
+        )
     
     def get_automation_templates(self) -> Dict:
-        """Get business automation templates and frameworks"""
-        return {
-            'process_mapping': {
-                'swimlane_diagram': 'Visual process flow with responsibilities',
-                'value_stream_map': 'End-to-end process with value-add analysis',
-                'flowchart': 'Decision-based process visualization',
-                'sops': 'Standard Operating Procedures documentation'
-            },
-            'automation_tools': {
-                'rpa': ['UiPath', 'Automation Anywhere', 'Blue Prism'],
-                'workflow': ['Microsoft Power Automate', 'Zapier', 'Nintex'],
-                'bpm': ['Pega', 'Appian', 'IBM BPM'],
-                'ai_ml': ['TensorFlow', 'Azure ML', 'Amazon SageMaker']
-            },
-            'frameworks': self.automation_frameworks,
-            'methodologies': {
-                'lean': 'Waste elimination and value creation',
-                'six_sigma': 'Data-driven process improvement',
-                'agile': 'Iterative development and continuous feedback',
-                'design_thinking': 'Human-centered problem solving'
-            }
-        }
+        """Get business automation templates and frameworks
+
+        Returns a read-only view built once at init; callers must not
+        mutate it (MappingProxyType raises on mutation attempts).
+        """
+        return self._templates
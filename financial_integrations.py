@@ -3,90 +3,73 @@ Financial Integration Manager - Comprehensive financial services integration
 Plaid, Alpha Vantage, banking APIs, and investment analysis
 """
 
+import asyncio
+import bisect
 import os
+import statistics
 import logging
+import re
 import requests
+from requests.adapters import HTTPAdapter, Retry
 import json
+
+try:
+    # orjson parses large quote payloads several times faster; fall back
+    # to stdlib json when it is not installed
+    import orjson
+    
+    def _json_loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 import time
 
 logger = logging.getLogger(__name__)
 
-class FinancialIntegrationManager:
-    """Manages financial data integrations and analysis"""
-    
-    def __init__(self, ai_provider_manager):
-        self.ai_provider = ai_provider_manager
-        
-        # API Keys from environment
-        self.plaid_client_id = os.environ.get('PLAID_CLIENT_ID', 'demo_client_id')
-        self.plaid_secret = os.environ.get('PLAID_SECRET', 'demo_secret')
-        self.alpha_vantage_key = os.environ.get('ALPHA_VANTAGE_API_KEY', 'demo_key')
-        self.polygon_key = os.environ.get('POLYGON_API_KEY', 'demo_key')
-        
-        # API Base URLs
-        self.alpha_vantage_base = "https://www.alphavantage.co/query"
-        self.polygon_base = "https://api.polygon.io"
-        
-        logger.info("Financial Integration Manager initialized")
-    
-    def get_market_analysis(self, query: str) -> str:
-        """Analyze market conditions and provide insights"""
-        try:
-            # Extract ticker symbols from query if any
-            tickers = self._extract_tickers(query)
-            
-            market_data = {}
-            
-            # Get market data for identified tickers
-            for ticker in tickers[:5]:  # Limit to 5 tickers to avoid rate limits
-                try:
-                    data = self._get_stock_data(ticker)
-                    if data:
-                        market_data[ticker] = data
-                except Exception as e:
-                    logger.warning(f"Failed to get data for {ticker}: {e}")
-            
-            # Get general market overview
-            market_overview = self._get_market_overview()
-            
-            # Generate AI analysis
-            analysis_prompt = f"""
-            Provide comprehensive financial market analysis based on the following data:
-            
-            Query: {query}
-            
-            Market Data: {json.dumps(market_data, indent=2) if market_data else "No specific ticker data available"}
-            
-            Market Overview: {json.dumps(market_overview, indent=2)}
-            
-            Please provide:
-            1. Current market conditions analysis
-            2. Specific stock insights (if applicable)
-            3. Investment recommendations
-            4. Risk assessment
-            5. Market trends and outlook
-            
-            Format the response in a clear, professional manner suitable for financial decision-making.
-            """
-            
-            response = self.ai_provider.get_completion(
-                analysis_prompt,
-                system_prompt="You are a professional financial analyst with expertise in market analysis, investment strategy, and risk management.",
-                temperature=0.3
-            )
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error in market analysis: {e}")
-            return f"I apologize, but I encountered an error while analyzing market conditions. Please try again or contact support if the issue persists."
-    
-    def portfolio_optimization(self, query: str) -> str:
-        """Provide portfolio optimization recommendations"""
-        try:
-            optimization_prompt = f"""
+_NY_TZ = ZoneInfo("America/New_York")
+
+# Sentiment buckets as a sorted threshold table; bisect picks the label
+# in one lookup instead of a five-arm comparison ladder
+_SENTIMENT_THRESHOLDS = (-2, -1, 0, 1)
+_SENTIMENT_LABELS = (
+    "Bearish - Market showing significant weakness",
+    "Moderately Bearish - Market under pressure",
+    "Neutral - Market showing mixed signals",
+    "Moderately Bullish - Market trending upward",
+    "Bullish - Market showing strong positive momentum"
+)
+
+# Ticker extraction runs on every user query before any network I/O, so
+# the pattern and stop-word set are built once at import
+_TICKER_RE = re.compile(r'\b[A-Z]{1,5}\b')
+_COMMON_WORDS = frozenset({
+    'THE', 'AND', 'FOR', 'ARE', 'BUT', 'NOT', 'YOU', 'ALL', 'CAN', 'HAD',
+    'HER', 'WAS', 'ONE', 'OUR', 'OUT', 'DAY', 'GET', 'HAS', 'HIM', 'HIS',
+    'HOW', 'ITS', 'NEW', 'NOW', 'OLD', 'SEE', 'TWO', 'WHO', 'BOY', 'DID',
+    'LET', 'PUT', 'SAY', 'SHE', 'TOO', 'USE'
+})
+
+# Known-good symbols (S&P 500, NASDAQ-100 and major ETFs) shipped with the
+# app so guaranteed-miss tokens like CEO or USD never burn Alpha Vantage
+# rate-limit budget on a doomed lookup
+try:
+    with open(os.path.join(os.path.dirname(__file__), 'tickers.txt')) as _f:
+        _VALID_TICKERS = frozenset(_f.read().split())
+except OSError:
+    logger.warning("tickers.txt not found - ticker validation disabled")
+    _VALID_TICKERS = None
+
+# Advice prompt specs: (template, system prompt, temperature, error
+# message). Built once at import instead of per call in each method.
+_ADVICE_SPECS = {
+    'portfolio': (
+        """
             Provide comprehensive portfolio optimization advice based on the following request:
             
             Query: {query}
@@ -101,25 +84,13 @@ class FinancialIntegrationManager:
             
             Consider modern portfolio theory, risk tolerance assessment, and current market conditions.
             Provide specific, actionable recommendations.
-            """
-            
-            response = self.ai_provider.get_completion(
-                optimization_prompt,
-                system_prompt="You are an expert portfolio manager and investment advisor with deep knowledge of modern portfolio theory, asset allocation, and risk management.",
-                temperature=0.4
-            )
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error in portfolio optimization: {e}")
-            return f"I apologize, but I encountered an error while analyzing your portfolio optimization request."
-    
-    def banking_analysis(self, query: str) -> str:
-        """Analyze banking and account information"""
-        try:
-            # Note: In a real implementation, this would integrate with Plaid for actual account data
-            banking_prompt = f"""
+            """,
+        "You are an expert portfolio manager and investment advisor with deep knowledge of modern portfolio theory, asset allocation, and risk management.",
+        0.4,
+        "I apologize, but I encountered an error while analyzing your portfolio optimization request."
+    ),
+    'banking': (
+        """
             Provide comprehensive banking and financial account analysis based on the following request:
             
             Query: {query}
@@ -133,27 +104,13 @@ class FinancialIntegrationManager:
             6. Cash flow management
             
             Provide practical, actionable advice for personal and business banking needs.
-            """
-            
-            response = self.ai_provider.get_completion(
-                banking_prompt,
-                system_prompt="You are a banking and financial services expert with knowledge of personal and business banking, credit management, and financial products.",
-                temperature=0.4
-            )
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error in banking analysis: {e}")
-            return f"I apologize, but I encountered an error while analyzing your banking request."
-    
-    def investment_advice(self, query: str) -> str:
-        """Provide investment recommendations and analysis"""
-        try:
-            # Get current market conditions
-            market_conditions = self._get_market_sentiment()
-            
-            investment_prompt = f"""
+            """,
+        "You are a banking and financial services expert with knowledge of personal and business banking, credit management, and financial products.",
+        0.4,
+        "I apologize, but I encountered an error while analyzing your banking request."
+    ),
+    'investment': (
+        """
             Provide comprehensive investment advice based on the following request:
             
             Query: {query}
@@ -170,24 +127,13 @@ class FinancialIntegrationManager:
             7. Alternative investment options
             
             Provide specific, actionable investment recommendations with clear reasoning.
-            """
-            
-            response = self.ai_provider.get_completion(
-                investment_prompt,
-                system_prompt="You are a certified financial advisor and investment strategist with expertise in securities analysis, investment planning, and wealth management.",
-                temperature=0.3
-            )
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error in investment advice: {e}")
-            return f"I apologize, but I encountered an error while generating investment advice."
-    
-    def financial_planning(self, query: str) -> str:
-        """Comprehensive financial planning assistance"""
-        try:
-            planning_prompt = f"""
+            """,
+        "You are a certified financial advisor and investment strategist with expertise in securities analysis, investment planning, and wealth management.",
+        0.3,
+        "I apologize, but I encountered an error while generating investment advice."
+    ),
+    'planning': (
+        """
             Provide comprehensive financial planning guidance based on the following request:
             
             Query: {query}
@@ -203,24 +149,13 @@ class FinancialIntegrationManager:
             8. Estate planning considerations
             
             Provide a structured, actionable financial plan with specific steps and timelines.
-            """
-            
-            response = self.ai_provider.get_completion(
-                planning_prompt,
-                system_prompt="You are a certified financial planner (CFP) with expertise in comprehensive financial planning, retirement planning, tax strategy, and wealth management.",
-                temperature=0.4
-            )
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error in financial planning: {e}")
-            return f"I apologize, but I encountered an error while creating your financial plan."
-    
-    def general_financial_advice(self, query: str) -> str:
-        """General financial guidance and advice"""
-        try:
-            advice_prompt = f"""
+            """,
+        "You are a certified financial planner (CFP) with expertise in comprehensive financial planning, retirement planning, tax strategy, and wealth management.",
+        0.4,
+        "I apologize, but I encountered an error while creating your financial plan."
+    ),
+    'general': (
+        """
             Provide comprehensive financial guidance based on the following question:
             
             Query: {query}
@@ -234,60 +169,300 @@ class FinancialIntegrationManager:
             - Planning strategies
             
             Ensure the advice is practical, well-reasoned, and appropriate for the user's apparent needs.
+            """,
+        "You are a knowledgeable financial advisor with broad expertise in personal finance, investments, and financial planning.",
+        0.5,
+        "I apologize, but I encountered an error while providing financial advice."
+    ),
+}
+
+class FinancialIntegrationManager:
+    """Manages financial data integrations and analysis"""
+    
+    def __init__(self, ai_provider_manager):
+        self.ai_provider = ai_provider_manager
+        
+        # API Keys from environment
+        self.plaid_client_id = os.environ.get('PLAID_CLIENT_ID', 'demo_client_id')
+        self.plaid_secret = os.environ.get('PLAID_SECRET', 'demo_secret')
+        self.alpha_vantage_key = os.environ.get('ALPHA_VANTAGE_API_KEY', 'demo_key')
+        self.polygon_key = os.environ.get('POLYGON_API_KEY', 'demo_key')
+        
+        # API Base URLs
+        self.alpha_vantage_base = "https://www.alphavantage.co/query"
+        self.polygon_base = "https://api.polygon.io"
+        
+        # Persistent session so repeated quote fetches reuse TCP/TLS
+        # connections instead of paying a handshake per call
+        self.http = requests.Session()
+        self.http.headers['Connection'] = 'keep-alive'
+        self.http.mount('https://', HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        ))
+        
+        # Quote data changes at most once per minute, so market responses
+        # are memoized on a minute bucket to shed repeat outbound calls
+        self._market_cache = {}
+        self._market_cache_lock = threading.Lock()
+        
+        logger.info("Financial Integration Manager initialized")
+    
+    def _cache_get(self, key: str, ttl: int = 60):
+        """Return a cached value if it is from the current TTL bucket"""
+        bucket = int(time.time() // ttl)
+        with self._market_cache_lock:
+            entry = self._market_cache.get(key)
+            if entry and entry[0] == bucket:
+                return entry[1]
+        return None
+    
+    def _cache_put(self, key: str, value, ttl: int = 60):
+        """Store a value under the current TTL bucket"""
+        bucket = int(time.time() // ttl)
+        with self._market_cache_lock:
+            self._market_cache[key] = (bucket, value)
+            if len(self._market_cache) > 512:
+                self._market_cache.pop(next(iter(self._market_cache)))
+    
+    def clear_cache(self):
+        """Drop all cached market data, e.g. after an ingestion event"""
+        with self._market_cache_lock:
+            self._market_cache.clear()
+    
+    def get_market_analysis(self, query: str) -> str:
+        """Analyze market conditions and provide insights"""
+        try:
+            # Extract ticker symbols from query if any
+            tickers = self._extract_tickers(query)
+            
+            # Get market data for identified tickers (max 5 to respect rate limits)
+            market_data = self._get_bulk_quotes(tickers[:5])
+            
+            # Get general market overview
+            market_overview = self._get_market_overview()
+            
+            # Generate AI analysis
+            analysis_prompt = f"""
+            Provide comprehensive financial market analysis based on the following data:
+            
+            Query: {query}
+            
+            Market Data: {json.dumps(market_data, separators=(',', ':')) if market_data else "No specific ticker data available"}
+            
+            Market Overview: {json.dumps(market_overview, separators=(',', ':'))}
+            
+            Please provide:
+            1. Current market conditions analysis
+            2. Specific stock insights (if applicable)
+            3. Investment recommendations
+            4. Risk assessment
+            5. Market trends and outlook
+            
+            Format the response in a clear, professional manner suitable for financial decision-making.
             """
             
             response = self.ai_provider.get_completion(
-                advice_prompt,
-                system_prompt="You are a knowledgeable financial advisor with broad expertise in personal finance, investments, and financial planning.",
-                temperature=0.5
+                analysis_prompt,
+                system_prompt="You are a professional financial analyst with expertise in market analysis, investment strategy, and risk management.",
+                temperature=0.3
             )
             
             return response
             
         except Exception as e:
-            logger.error(f"Error in general financial advice: {e}")
-            return f"I apologize, but I encountered an error while providing financial advice."
+            logger.error(f"Error in market analysis: {e}")
+            return f"I apologize, but I encountered an error while analyzing market conditions. Please try again or contact support if the issue persists."
+    
+    def portfolio_optimization(self, query: str) -> str:
+        """Provide portfolio optimization recommendations"""
+        return self._advise('portfolio', query)
+    
+    def banking_analysis(self, query: str) -> str:
+        """Analyze banking and account information"""
+        return self._advise('banking', query)
+    
+    def investment_advice(self, query: str) -> str:
+        """Provide investment recommendations and analysis"""
+        market_conditions = self._get_market_sentiment()
+        return self._advise('investment', query,
+                            market_conditions=market_conditions)
+    
+    def financial_planning(self, query: str) -> str:
+        """Comprehensive financial planning assistance"""
+        return self._advise('planning', query)
+    
+    def general_financial_advice(self, query: str) -> str:
+        """General financial guidance and advice"""
+        return self._advise('general', query)
+    
+    def _advise(self, kind: str, query: str, **extra) -> str:
+        """Run one advice prompt through the provider from the spec table"""
+        template, system_prompt, temperature, error_msg = _ADVICE_SPECS[kind]
+        try:
+            prompt = template.format(query=query, **extra)
+            return self.ai_provider.get_completion(
+                prompt,
+                system_prompt=system_prompt,
+                temperature=temperature
+            )
+        except Exception as e:
+            logger.error("Error in %s advice: %s", kind, e)
+            return error_msg
+    
+    async def aget_market_analysis(self, query: str) -> str:
+        """Async variant of get_market_analysis"""
+        return await asyncio.to_thread(self.get_market_analysis, query)
+    
+    async def aportfolio_optimization(self, query: str) -> str:
+        """Async variant of portfolio_optimization"""
+        return await asyncio.to_thread(self.portfolio_optimization, query)
+    
+    async def abanking_analysis(self, query: str) -> str:
+        """Async variant of banking_analysis"""
+        return await asyncio.to_thread(self.banking_analysis, query)
+    
+    async def ainvestment_advice(self, query: str) -> str:
+        """Async variant of investment_advice"""
+        return await asyncio.to_thread(self.investment_advice, query)
+    
+    async def afinancial_planning(self, query: str) -> str:
+        """Async variant of financial_planning"""
+        return await asyncio.to_thread(self.financial_planning, query)
+    
+    async def ageneral_financial_advice(self, query: str) -> str:
+        """Async variant of general_financial_advice"""
+        return await asyncio.to_thread(self.general_financial_advice, query)
     
     def _extract_tickers(self, text: str) -> List[str]:
         """Extract stock ticker symbols from text"""
-        import re
+        candidates = _TICKER_RE.findall(text.upper())
+        tickers = [t for t in candidates if t not in _COMMON_WORDS]
+        if _VALID_TICKERS is not None:
+            tickers = [t for t in tickers if t in _VALID_TICKERS]
+        return tickers[:10]
+    
+    def _get_bulk_quotes(self, tickers: List[str]) -> Dict[str, Dict]:
+        """Fetch quotes for several tickers in one Polygon snapshot call
         
-        # Common stock ticker patterns
-        ticker_pattern = r'\b[A-Z]{1,5}\b'
-        potential_tickers = re.findall(ticker_pattern, text.upper())
+        One bulk GET replaces a round-trip per ticker. Falls back to the
+        per-ticker Alpha Vantage fan-out when Polygon is not configured or
+        the snapshot call fails.
+        """
+        results = {}
+        missing = []
+        for ticker in tickers:
+            cached = self._cache_get(f"quote:{ticker}")
+            if cached is not None:
+                results[ticker] = cached
+            else:
+                missing.append(ticker)
         
-        # Filter out common words that aren't tickers
-        common_words = {'THE', 'AND', 'FOR', 'ARE', 'BUT', 'NOT', 'YOU', 'ALL', 'CAN', 'HAD', 'HER', 'WAS', 'ONE', 'OUR', 'OUT', 'DAY', 'GET', 'HAS', 'HIM', 'HIS', 'HOW', 'ITS', 'NEW', 'NOW', 'OLD', 'SEE', 'TWO', 'WHO', 'BOY', 'DID', 'ITS', 'LET', 'PUT', 'SAY', 'SHE', 'TOO', 'USE'}
+        if not missing:
+            return results
         
-        tickers = [t for t in potential_tickers if t not in common_words and len(t) <= 5]
+        if self.polygon_key != 'demo_key':
+            try:
+                response = self.http.get(
+                    f"{self.polygon_base}/v2/snapshot/locale/us/markets/stocks/tickers",
+                    params={'tickers': ','.join(missing), 'apiKey': self.polygon_key},
+                    timeout=10
+                )
+                response.raise_for_status()
+                
+                for item in _json_loads(response.content).get('tickers', []):
+                    symbol = item.get('ticker')
+                    if not symbol:
+                        continue
+                    day = item.get('day', {})
+                    change_percent_num = float(item.get('todaysChangePerc', 0) or 0)
+                    quote = {
+                        'symbol': symbol,
+                        'price': str(day.get('c', 0)),
+                        'change': str(item.get('todaysChange', 0)),
+                        'change_percent': f"{change_percent_num}%",
+                        'change_percent_num': change_percent_num,
+                        'high': str(day.get('h', 0)),
+                        'low': str(day.get('l', 0)),
+                        'volume': str(day.get('v', 0))
+                    }
+                    self._cache_put(f"quote:{symbol}", quote)
+                    results[symbol] = quote
+                
+                return results
+                
+            except Exception as e:
+                logger.warning(f"Bulk quote fetch failed, falling back to per-ticker: {e}")
         
-        return tickers[:10]  # Return max 10 tickers
+        results.update(self._fetch_many(missing))
+        return results
+    
+    def _fetch_many(self, tickers: List[str]) -> Dict[str, Dict]:
+        """Fetch quotes for several tickers concurrently
+        
+        The serial loop paid one full round-trip per ticker; overlapping
+        the requests keeps wall time near a single round-trip. Bounded at
+        five workers to stay inside Alpha Vantage rate limits.
+        """
+        results = {}
+        if not tickers:
+            return results
+        
+        with ThreadPoolExecutor(max_workers=min(5, len(tickers))) as pool:
+            futures = {pool.submit(self._get_stock_data, t): t for t in tickers}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    data = future.result()
+                    if data:
+                        results[ticker] = data
+                except Exception as e:
+                    logger.warning(f"Failed to get data for {ticker}: {e}")
+        
+        return results
     
     def _get_stock_data(self, ticker: str) -> Dict:
         """Get stock data from Alpha Vantage"""
         try:
+            cached = self._cache_get(f"quote:{ticker}")
+            if cached is not None:
+                return cached
+            
             params = {
                 'function': 'GLOBAL_QUOTE',
                 'symbol': ticker,
                 'apikey': self.alpha_vantage_key
             }
             
-            response = requests.get(self.alpha_vantage_base, params=params, timeout=10)
+            response = self.http.get(self.alpha_vantage_base, params=params, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = _json_loads(response.content)
             
             if 'Global Quote' in data:
                 quote = data['Global Quote']
-                return {
+                change_percent = quote.get('10. Change Percent', '0%')
+                try:
+                    change_percent_num = float(change_percent.rstrip('%'))
+                except ValueError:
+                    change_percent_num = 0.0
+                result = {
                     'symbol': quote.get('01. Symbol', ticker),
                     'price': quote.get('05. Price', '0'),
                     'change': quote.get('09. Change', '0'),
-                    'change_percent': quote.get('10. Change Percent', '0%'),
+                    'change_percent': change_percent,
+                    'change_percent_num': change_percent_num,
                     'high': quote.get('03. High', '0'),
                     'low': quote.get('04. Low', '0'),
                     'volume': quote.get('06. Volume', '0')
                 }
+                self._cache_put(f"quote:{ticker}", result)
+                return result
             
             return {}
             
@@ -298,20 +473,21 @@ class FinancialIntegrationManager:
     def _get_market_overview(self) -> Dict:
         """Get general market overview"""
         try:
+            cached = self._cache_get('overview')
+            if cached is not None:
+                return cached
+            
             # Get major indices data
             indices = ['SPY', 'QQQ', 'DIA']  # S&P 500, NASDAQ, Dow Jones ETFs
-            market_data = {}
+            market_data = self._get_bulk_quotes(indices)
             
-            for index in indices:
-                data = self._get_stock_data(index)
-                if data:
-                    market_data[index] = data
-            
-            return {
+            overview = {
                 'timestamp': datetime.utcnow().isoformat(),
                 'indices': market_data,
                 'market_status': 'open' if self._is_market_open() else 'closed'
             }
+            self._cache_put('overview', overview)
+            return overview
             
         except Exception as e:
             logger.error(f"Error getting market overview: {e}")
@@ -320,31 +496,27 @@ class FinancialIntegrationManager:
     def _get_market_sentiment(self) -> str:
         """Get current market sentiment analysis"""
         try:
+            cached = self._cache_get('sentiment')
+            if cached is not None:
+                return cached
+            
             # Simple market sentiment based on major indices
             indices_data = self._get_market_overview()
             
             sentiment_factors = []
             
             if 'indices' in indices_data:
-                for symbol, data in indices_data['indices'].items():
-                    try:
-                        change_percent = float(data['change_percent'].replace('%', ''))
+                for data in indices_data['indices'].values():
+                    change_percent = data.get('change_percent_num')
+                    if change_percent is not None:
                         sentiment_factors.append(change_percent)
-                    except (ValueError, KeyError):
-                        continue
             
             if sentiment_factors:
-                avg_change = sum(sentiment_factors) / len(sentiment_factors)
-                if avg_change > 1:
-                    return "Bullish - Market showing strong positive momentum"
-                elif avg_change > 0:
-                    return "Moderately Bullish - Market trending upward"
-                elif avg_change > -1:
-                    return "Neutral - Market showing mixed signals"
-                elif avg_change > -2:
-                    return "Moderately Bearish - Market under pressure"
-                else:
-                    return "Bearish - Market showing significant weakness"
+                avg_change = statistics.fmean(sentiment_factors)
+                bucket = bisect.bisect_left(_SENTIMENT_THRESHOLDS, avg_change)
+                sentiment = _SENTIMENT_LABELS[bucket]
+                self._cache_put('sentiment', sentiment)
+                return sentiment
             
             return "Neutral - Unable to determine clear market sentiment"
             
@@ -355,18 +527,23 @@ class FinancialIntegrationManager:
     def _is_market_open(self) -> bool:
         """Check if US stock market is currently open"""
         try:
-            now = datetime.utcnow()
-            # Simple check - US market is open 9:30 AM - 4:00 PM EST, Monday-Friday
-            # This is a simplified implementation
-            weekday = now.weekday()  # 0 = Monday, 6 = Sunday
-            
-            if weekday > 4:  # Weekend
-                return False
-            
-            # Convert to EST (simplified - doesn't account for DST properly)
-            est_hour = (now.hour - 5) % 24
-            
-            return 9 <= est_hour < 16  # 9:30 AM to 4:00 PM EST (simplified)
+            cached = self._cache_get('market_open', ttl=30)
+            if cached is not None:
+                return cached
+            
+            # Regular session is 9:30-16:00 America/New_York, Monday-Friday;
+            # zoneinfo handles the EST/EDT switch the old fixed-offset math
+            # got wrong half the year (holidays are not accounted for)
+            now = datetime.now(_NY_TZ)
+            if now.weekday() > 4:  # Weekend
+                is_open = False
+            else:
+                open_time = now.replace(hour=9, minute=30, second=0, microsecond=0)
+                close_time = now.replace(hour=16, minute=0, second=0, microsecond=0)
+                is_open = open_time <= now < close_time
+            
+            self._cache_put('market_open', is_open, ttl=30)
+            return is_open
             
         except Exception:
             return False
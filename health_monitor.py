@@ -3,19 +3,25 @@ Health Monitor - System health monitoring and agent recovery
 Real-time monitoring of agent health and automatic recovery
 """
 
+import asyncio
 import logging
 import time
 import threading
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, List
 import psutil
 import os
 
+from sqlalchemy import func, update
+
 from app import db
 from models import AgentInstance, SystemMetrics
 
 logger = logging.getLogger(__name__)
 
+_HAS_LOADAVG = hasattr(os, 'getloadavg')
+
 class HealthMonitor:
     """Monitors system and agent health with automatic recovery"""
     
@@ -23,8 +29,25 @@ class HealthMonitor:
         self.check_interval = check_interval
         self.recovery_enabled = recovery_enabled
         self.running = False
-        self.health_history = []
-        self.alerts = []
+        # Bounded deques auto-evict the oldest entry on append; the old
+        # list + pop(0) pattern shifted every element per insert
+        self.health_history = deque(maxlen=100)
+        self.alerts = deque(maxlen=50)
+        
+        # Shared status-count snapshot; the health loop hits several
+        # consumers in quick succession, so one grouped query serves them
+        # all for a few seconds
+        self._status_counts_cache = None
+        self._status_counts_at = 0.0
+        
+        # Last time each agent's health-check stamp was actually written;
+        # steady-state cycles skip the write entirely
+        self._last_persisted_check = {}
+        
+        # System metrics snapshot reused for a second so load-balancer
+        # probe storms cost one set of /proc reads per second, not per hit
+        self._metrics_cache = None
+        self._metrics_cache_at = 0.0
         
         # Health thresholds
         self.thresholds = {
@@ -41,8 +64,10 @@ class HealthMonitor:
             return
         
         self.running = True
-        self._start_health_checker()
-        self._start_system_monitor()
+        # Prime the non-blocking CPU sampler; the first delta reading is
+        # only meaningful after this call
+        psutil.cpu_percent(interval=None)
+        threading.Thread(target=self._run_monitor_loop, daemon=True).start()
         logger.info("Health monitor started")
     
     def stop(self):
@@ -50,35 +75,48 @@ class HealthMonitor:
         self.running = False
         logger.info("Health monitor stopped")
     
-    def _start_health_checker(self):
-        """Start the agent health checking thread"""
-        def health_check_loop():
-            while self.running:
-                try:
-                    self._check_agent_health()
-                    self._check_system_health()
-                    self._perform_recovery_actions()
-                    time.sleep(self.check_interval)
-                
-                except Exception as e:
-                    logger.error(f"Error in health check loop: {e}")
-                    time.sleep(5)  # Short delay on error
-        
-        threading.Thread(target=health_check_loop, daemon=True).start()
+    def _run_monitor_loop(self):
+        """Host both monitor coroutines on one event loop in one thread"""
+        asyncio.run(self._monitor_main())
     
-    def _start_system_monitor(self):
-        """Start the system resource monitoring thread"""
-        def system_monitor_loop():
-            while self.running:
-                try:
-                    self._record_system_metrics()
-                    time.sleep(60)  # Record every minute
-                
-                except Exception as e:
-                    logger.error(f"Error in system monitor: {e}")
-                    time.sleep(10)
-        
-        threading.Thread(target=system_monitor_loop, daemon=True).start()
+    async def _monitor_main(self):
+        """Run the health-check and metrics loops concurrently"""
+        await asyncio.gather(self._health_loop(), self._metrics_loop())
+    
+    async def _health_loop(self):
+        """Agent and system health checking loop"""
+        while self.running:
+            try:
+                self._check_agent_health()
+                self._check_system_health()
+                self._perform_recovery_actions()
+                await asyncio.sleep(self.check_interval)
+            
+            except Exception as e:
+                logger.error(f"Error in health check loop: {e}")
+                await asyncio.sleep(5)  # Short delay on error
+    
+    async def _metrics_loop(self):
+        """System resource metrics recording loop"""
+        while self.running:
+            try:
+                self._record_system_metrics()
+                await asyncio.sleep(60)  # Record every minute
+            
+            except Exception as e:
+                logger.error(f"Error in system monitor: {e}")
+                await asyncio.sleep(10)
+    
+    def _status_counts(self) -> Dict:
+        """Agent counts by status from one grouped query, cached 5s"""
+        now = time.monotonic()
+        if self._status_counts_cache is None or now - self._status_counts_at > 5:
+            self._status_counts_cache = dict(
+                db.session.query(AgentInstance.status, func.count())
+                .group_by(AgentInstance.status).all()
+            )
+            self._status_counts_at = now
+        return self._status_counts_cache
     
     def _check_agent_health(self):
         """Check health of all agents"""
@@ -97,6 +135,26 @@ class HealthMonitor:
                 # Log health issues
                 logger.warning(f"Agent {agent.instance_id} health issues: {health_issues}")
         
+        # Stamp last_health_check in one bulk UPDATE, but only for agents
+        # with active issues or whose stamp is older than five minutes -
+        # a healthy steady-state cycle writes nothing
+        now = datetime.utcnow()
+        unhealthy_ids = {entry['agent'].id for entry in unhealthy_agents}
+        stale_ids = [
+            a.id for a in agents
+            if a.id in unhealthy_ids
+            or now - self._last_persisted_check.get(a.id, datetime.min) > timedelta(minutes=5)
+        ]
+        if stale_ids:
+            db.session.execute(
+                update(AgentInstance)
+                .where(AgentInstance.id.in_(stale_ids))
+                .values(last_health_check=now)
+            )
+            db.session.commit()
+            for agent_id in stale_ids:
+                self._last_persisted_check[agent_id] = now
+        
         # Record health check
         self._record_health_check(len(agents), len(unhealthy_agents))
         
@@ -124,17 +182,13 @@ class HealthMonitor:
         if agent.status == 'busy' and agent.current_load == 0:
             issues.append("Agent stuck in busy state")
         
-        # Update last health check
-        with db.session.begin():
-            agent.last_health_check = datetime.utcnow()
-        
         return issues
     
     def _check_system_health(self):
         """Check overall system health"""
         try:
-            # Check CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # Check CPU usage (non-blocking delta since the last sample)
+            cpu_percent = psutil.cpu_percent(interval=None)
             if cpu_percent > self.thresholds['system_cpu_max']:
                 self._add_alert(f"High CPU usage: {cpu_percent:.1f}%", 'warning')
             
@@ -144,7 +198,7 @@ class HealthMonitor:
                 self._add_alert(f"High memory usage: {memory.percent:.1f}%", 'warning')
             
             # Check failed agents
-            failed_agents = AgentInstance.query.filter_by(status='failed').count()
+            failed_agents = self._status_counts().get('failed', 0)
             if failed_agents > self.thresholds['failed_agents_max']:
                 self._add_alert(f"Too many failed agents: {failed_agents}", 'error')
             
@@ -225,10 +279,6 @@ class HealthMonitor:
         }
         
         self.health_history.append(health_record)
-        
-        # Keep only last 100 records
-        if len(self.health_history) > 100:
-            self.health_history.pop(0)
     
     def _record_system_metrics(self):
         """Record system performance metrics"""
@@ -237,14 +287,15 @@ class HealthMonitor:
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
             
-            # Count agents by status
-            agents = AgentInstance.query.all()
+            # Count agents by status in one grouped query instead of
+            # loading every row and scanning the list four times
+            rows = self._status_counts()
             agent_stats = {
-                'total': len(agents),
-                'active': len([a for a in agents if a.status in ['idle', 'busy']]),
-                'idle': len([a for a in agents if a.status == 'idle']),
-                'busy': len([a for a in agents if a.status == 'busy']),
-                'failed': len([a for a in agents if a.status == 'failed'])
+                'total': sum(rows.values()),
+                'active': rows.get('idle', 0) + rows.get('busy', 0),
+                'idle': rows.get('idle', 0),
+                'busy': rows.get('busy', 0),
+                'failed': rows.get('failed', 0)
             }
             
             # Save to database
@@ -279,36 +330,39 @@ class HealthMonitor:
             logging.INFO,
             f"Health Alert [{level.upper()}]: {message}"
         )
-        
-        # Keep only last 50 alerts
-        if len(self.alerts) > 50:
-            self.alerts.pop(0)
     
     def get_health_status(self) -> Dict:
         """Get current health status"""
-        agents = AgentInstance.query.all()
+        counts = self._status_counts()
         
         return {
             'overall_health': 'good' if len(self.alerts) == 0 else 'warning',
             'agent_health': {
-                'total': len(agents),
-                'healthy': len([a for a in agents if a.status in ['idle', 'busy']]),
-                'failed': len([a for a in agents if a.status == 'failed'])
+                'total': sum(counts.values()),
+                'healthy': counts.get('idle', 0) + counts.get('busy', 0),
+                'failed': counts.get('failed', 0)
             },
-            'recent_alerts': self.alerts[-10:],  # Last 10 alerts
-            'health_history': self.health_history[-20:],  # Last 20 health checks
+            'recent_alerts': list(self.alerts)[-10:],  # Last 10 alerts
+            'health_history': list(self.health_history)[-20:],  # Last 20 health checks
             'recovery_enabled': self.recovery_enabled
         }
     
     def get_system_metrics(self) -> Dict:
         """Get current system metrics"""
         try:
-            return {
+            now = time.monotonic()
+            if self._metrics_cache is not None and now - self._metrics_cache_at < 1.0:
+                return self._metrics_cache
+            
+            metrics = {
                 'cpu_percent': psutil.cpu_percent(),
                 'memory_percent': psutil.virtual_memory().percent,
                 'disk_percent': psutil.disk_usage('/').percent,
-                'load_average': os.getloadavg() if hasattr(os, 'getloadavg') else [0, 0, 0]
+                'load_average': os.getloadavg() if _HAS_LOADAVG else [0, 0, 0]
             }
+            self._metrics_cache = metrics
+            self._metrics_cache_at = now
+            return metrics
         except Exception as e:
             logger.error(f"Error getting system metrics: {e}")
             return {
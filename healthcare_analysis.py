@@ -3,43 +3,82 @@ Healthcare Analysis Engine - Medical diagnosis, treatment recommendations, and h
 Advanced medical AI capabilities with safety protocols
 """
 
+import asyncio
+import hashlib
 import logging
 import json
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict, deque
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Optional, Any
 from datetime import datetime
 import re
 
 logger = logging.getLogger(__name__)
 
-class HealthcareAnalyzer:
-    """Advanced healthcare analysis and medical AI assistant"""
-    
-    def __init__(self, ai_provider_manager):
-        self.ai_provider = ai_provider_manager
-        
-        # Medical knowledge bases and drug interaction databases
-        self.medical_disclaimer = """
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+# ASCII-only lowercasing through bytes.translate: a single C-level table
+# pass instead of str.lower()'s per-codepoint Unicode case folding.
+# Only bytes 65-90 are remapped, so UTF-8 multibyte sequences pass
+# through untouched.
+_LOWER_TABLE = bytes.maketrans(
+    bytes(range(256)),
+    bytes(c | 0x20 if 65 <= c <= 90 else c for c in range(256))
+)
+
+def _fold(text: str) -> str:
+    """ASCII-lowercase text on the extractor hot path"""
+    return text.encode('utf-8', 'ignore').translate(_LOWER_TABLE).decode('utf-8', 'ignore')
+
+def _tokenize(text: str) -> FrozenSet[str]:
+    """Lowercased word tokens of a query, for near-duplicate matching"""
+    return frozenset(_TOKEN_RE.findall(_fold(text)))
+
+# Keyword tables built once at import. Single-word entries resolve with
+# one O(1) set-membership test per token of the input; only the handful
+# of multi-word entries like 'chest pain' need a substring scan.
+_SYMPTOM_KEYWORDS = (
+    'pain', 'ache', 'hurt', 'sore', 'tender', 'swollen', 'fever', 'chills',
+    'nausea', 'vomiting', 'diarrhea', 'constipation', 'headache', 'dizzy',
+    'fatigue', 'tired', 'weakness', 'shortness of breath', 'cough', 'chest pain',
+    'abdominal pain', 'back pain', 'joint pain', 'muscle pain', 'rash', 'itchy',
+    'burning', 'stinging', 'cramping', 'bloating', 'heartburn', 'indigestion',
+    'congestion', 'runny nose', 'sneezing', 'watery eyes', 'blurred vision',
+    'ringing ears', 'hearing loss', 'difficulty swallowing', 'hoarse voice'
+)
+_SYMPTOM_SINGLE = frozenset(k for k in _SYMPTOM_KEYWORDS if ' ' not in k)
+_SYMPTOM_MULTI = tuple(k for k in _SYMPTOM_KEYWORDS if ' ' in k)
+
+_COMMON_DRUGS = (
+    'aspirin', 'ibuprofen', 'acetaminophen', 'tylenol', 'advil', 'aleve',
+    'metformin', 'insulin', 'lisinopril', 'amlodipine', 'metoprolol',
+    'atorvastatin', 'simvastatin', 'levothyroxine', 'omeprazole',
+    'prednisone', 'albuterol', 'warfarin', 'clopidogrel', 'gabapentin'
+)
+_DRUG_SET = frozenset(_COMMON_DRUGS)
+
+# Medication suffix families (antibiotics, ACE inhibitors, beta blockers,
+# statins) unioned into one pattern so the text is scanned once
+_MED_SUFFIX_RE = re.compile(r'\b\w+(?:mycin|pril|olol|statin)\b', re.IGNORECASE)
+
+# Static prompt prefixes per domain, kept byte-identical across calls
+# so the provider can reuse its cached encoding of the long invariant
+# part; only the short query tail varies per request
+_DISCLAIMER = """
         IMPORTANT MEDICAL DISCLAIMER: This AI assistant provides general health information for educational purposes only. 
         It is not a substitute for professional medical advice, diagnosis, or treatment. Always consult with qualified 
         healthcare professionals for medical concerns. In emergencies, call 911 or go to the nearest emergency room immediately.
         """
-        
-        logger.info("Healthcare Analyzer initialized")
-    
-    def analyze_symptoms(self, query: str) -> str:
-        """Analyze symptoms and provide medical insights"""
-        try:
-            # Extract symptoms and medical context
-            symptoms = self._extract_symptoms(query)
-            
-            analysis_prompt = f"""
-            {self.medical_disclaimer}
+
+# Prebuilt once so responses prepend the disclaimer with a single
+# concatenation instead of rebuilding the ~1 KB string per request
+_DISCLAIMER_PREFIX = _DISCLAIMER + "\n\n"
+
+_SYMPTOM_ANALYSIS_PREFIX = f"""
+{_DISCLAIMER}
             
             Analyze the following symptoms and medical query:
-            
-            Query: {query}
-            Identified Symptoms: {symptoms}
-            
+
             Please provide a comprehensive analysis including:
             
             1. SYMPTOM ASSESSMENT:
@@ -67,32 +106,12 @@ class HealthcareAnalyzer:
             
             Always emphasize the importance of professional medical consultation and never provide definitive diagnoses.
             """
-            
-            response = self.ai_provider.get_completion(
-                analysis_prompt,
-                system_prompt="You are a medical AI assistant with advanced knowledge of clinical medicine, differential diagnosis, and patient care protocols. Always prioritize patient safety and emphasize the need for professional medical consultation.",
-                temperature=0.2  # Low temperature for medical accuracy
-            )
-            
-            return f"{self.medical_disclaimer}\n\n{response}"
-            
-        except Exception as e:
-            logger.error(f"Error in symptom analysis: {e}")
-            return f"{self.medical_disclaimer}\n\nI apologize, but I encountered an error while analyzing the symptoms. Please consult with a healthcare professional for proper medical evaluation."
-    
-    def medication_analysis(self, query: str) -> str:
-        """Analyze medications, interactions, and pharmaceutical information"""
-        try:
-            medications = self._extract_medications(query)
-            
-            medication_prompt = f"""
-            {self.medical_disclaimer}
+
+_MEDICATION_PREFIX = f"""
+{_DISCLAIMER}
             
             Provide comprehensive pharmaceutical analysis for the following query:
-            
-            Query: {query}
-            Identified Medications: {medications}
-            
+
             Please provide detailed information on:
             
             1. MEDICATION OVERVIEW:
@@ -126,27 +145,10 @@ class HealthcareAnalyzer:
             
             Always emphasize the importance of following healthcare provider instructions and pharmacist guidance.
             """
-            
-            response = self.ai_provider.get_completion(
-                medication_prompt,
-                system_prompt="You are a clinical pharmacist AI with expertise in pharmacology, drug interactions, and medication therapy management. Always prioritize patient safety and medication adherence.",
-                temperature=0.1  # Very low temperature for pharmaceutical accuracy
-            )
-            
-            return f"{self.medical_disclaimer}\n\n{response}"
-            
-        except Exception as e:
-            logger.error(f"Error in medication analysis: {e}")
-            return f"{self.medical_disclaimer}\n\nI apologize, but I encountered an error while analyzing the medication information. Please consult with your pharmacist or healthcare provider."
-    
-    def insurance_navigation(self, query: str) -> str:
-        """Help navigate healthcare insurance and coverage issues"""
-        try:
-            insurance_prompt = f"""
+
+_INSURANCE_PREFIX = f"""
             Provide comprehensive healthcare insurance guidance based on the following query:
-            
-            Query: {query}
-            
+
             Please address the following aspects:
             
             1. INSURANCE BASICS:
@@ -181,27 +183,10 @@ class HealthcareAnalyzer:
             
             Provide practical, actionable advice for navigating the healthcare insurance system effectively.
             """
-            
-            response = self.ai_provider.get_completion(
-                insurance_prompt,
-                system_prompt="You are a healthcare insurance specialist with expertise in insurance navigation, healthcare economics, and patient advocacy.",
-                temperature=0.3
-            )
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error in insurance navigation: {e}")
-            return "I apologize, but I encountered an error while providing insurance navigation guidance. Please contact your insurance provider directly or speak with a healthcare advocate."
-    
-    def wellness_coaching(self, query: str) -> str:
-        """Provide wellness and lifestyle coaching"""
-        try:
-            wellness_prompt = f"""
+
+_WELLNESS_PREFIX = f"""
             Provide comprehensive wellness and lifestyle coaching based on the following query:
-            
-            Query: {query}
-            
+
             Please provide guidance on:
             
             1. LIFESTYLE ASSESSMENT:
@@ -242,29 +227,12 @@ class HealthcareAnalyzer:
             
             Provide evidence-based, practical recommendations that can be implemented gradually.
             """
-            
-            response = self.ai_provider.get_completion(
-                wellness_prompt,
-                system_prompt="You are a certified wellness coach with expertise in lifestyle medicine, nutrition, exercise physiology, and behavior change.",
-                temperature=0.4
-            )
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error in wellness coaching: {e}")
-            return "I apologize, but I encountered an error while providing wellness guidance. Please consult with a certified wellness coach or healthcare provider."
-    
-    def general_health_advice(self, query: str) -> str:
-        """Provide general health information and guidance"""
-        try:
-            health_prompt = f"""
-            {self.medical_disclaimer}
+
+_HEALTH_ADVICE_PREFIX = f"""
+{_DISCLAIMER}
             
             Provide comprehensive health information and guidance for the following query:
-            
-            Query: {query}
-            
+
             Please provide educational information covering relevant aspects such as:
             - Health condition overview
             - Risk factors and prevention
@@ -275,97 +243,282 @@ class HealthcareAnalyzer:
             
             Ensure all information is evidence-based, current, and emphasizes the importance of professional medical consultation.
             """
+
+# Static resource directory, built once and exposed through read-only
+# views so callers cannot mutate the shared copy
+_HEALTH_RESOURCES = MappingProxyType({
+    'emergency': MappingProxyType({
+        'number': '911',
+        'poison_control': '1-800-222-1222',
+        'suicide_prevention': '988',
+        'crisis_text_line': 'Text HOME to 741741'
+    }),
+    'resources': MappingProxyType({
+        'cdc': 'https://www.cdc.gov',
+        'nih': 'https://www.nih.gov',
+        'mayo_clinic': 'https://www.mayoclinic.org',
+        'webmd': 'https://www.webmd.com',
+        'medline_plus': 'https://medlineplus.gov'
+    }),
+    'professional_help': MappingProxyType({
+        'find_doctor': 'Contact your insurance provider or visit healthcare.gov',
+        'mental_health': 'Psychology Today, NAMI, or your EAP program',
+        'specialists': 'Ask for referrals from your primary care physician'
+    })
+})
+
+# Full system prompts: persona plus the complete rubric. Keeping the
+# whole invariant part in the system prompt lets providers KV-cache it
+# across requests while the per-request user message shrinks to just
+# the query payload
+_SYMPTOM_SYSTEM = (
+    "You are a medical AI assistant with advanced knowledge of clinical medicine, "
+    "differential diagnosis, and patient care protocols. Always prioritize patient "
+    "safety and emphasize the need for professional medical consultation.\n"
+    + _SYMPTOM_ANALYSIS_PREFIX
+)
+
+_MEDICATION_SYSTEM = (
+    "You are a clinical pharmacist AI with expertise in pharmacology, drug "
+    "interactions, and medication therapy management. Always prioritize patient "
+    "safety and medication adherence.\n"
+    + _MEDICATION_PREFIX
+)
+
+_INSURANCE_SYSTEM = (
+    "You are a healthcare insurance specialist with expertise in insurance "
+    "navigation, healthcare economics, and patient advocacy.\n"
+    + _INSURANCE_PREFIX
+)
+
+_WELLNESS_SYSTEM = (
+    "You are a certified wellness coach with expertise in lifestyle medicine, "
+    "nutrition, exercise physiology, and behavior change.\n"
+    + _WELLNESS_PREFIX
+)
+
+_HEALTH_ADVICE_SYSTEM = (
+    "You are a health educator with comprehensive medical knowledge, focused on "
+    "providing accurate, evidence-based health information while emphasizing the "
+    "importance of professional medical care.\n"
+    + _HEALTH_ADVICE_PREFIX
+)
+
+class HealthcareAnalyzer:
+    """Advanced healthcare analysis and medical AI assistant"""
+    
+    def __init__(self, ai_provider_manager):
+        self.ai_provider = ai_provider_manager
+        
+        # Shared reference to the module-level disclaimer constant
+        self.medical_disclaimer = _DISCLAIMER
+
+        # Semantic answer cache: exact-match LRU plus a token-overlap
+        # near-miss ring, namespaced per analysis domain so a symptom
+        # answer never serves a medication query
+        self._cache = OrderedDict()
+        self._cache_max = 512
+        self._near_cache = deque(maxlen=2048)
+        self._near_threshold = 0.9
+
+        logger.info("Healthcare Analyzer initialized")
+
+    def _find_near_match(self, domain: str, query_tokens: FrozenSet[str]) -> Optional[str]:
+        """Return a cached response whose query closely overlaps this one"""
+        if not query_tokens:
+            return None
+        for cached_domain, cached_tokens, response in self._near_cache:
+            if cached_domain != domain:
+                continue
+            union = len(query_tokens | cached_tokens)
+            if union and len(query_tokens & cached_tokens) / union >= self._near_threshold:
+                return response
+        return None
+
+    def _cached_completion(self, domain: str, query: str, prompt: str,
+                          system_prompt: str, temperature: float) -> str:
+        """Serve repeated or near-duplicate queries from cache before the LLM"""
+        key = hashlib.sha256(f"{domain}\x1f{query}".encode()).hexdigest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        query_tokens = _tokenize(query)
+        near = self._find_near_match(domain, query_tokens)
+        if near is not None:
+            return near
+
+        response = self.ai_provider.get_completion(
+            prompt,
+            system_prompt=system_prompt,
+            temperature=temperature
+        )
+
+        self._cache[key] = response
+        if len(self._cache) > self._cache_max:
+            self._cache.popitem(last=False)
+        self._near_cache.append((domain, query_tokens, response))
+
+        return response
+    
+    def analyze_symptoms(self, query: str) -> str:
+        """Analyze symptoms and provide medical insights"""
+        try:
+            # Extract symptoms and medical context
+            symptoms = self._extract_symptoms(query)
             
-            response = self.ai_provider.get_completion(
-                health_prompt,
-                system_prompt="You are a health educator with comprehensive medical knowledge, focused on providing accurate, evidence-based health information while emphasizing the importance of professional medical care.",
+            analysis_prompt = f"Query: {query}\nIdentified Symptoms: {symptoms}"
+
+            response = self._cached_completion(
+                'symptoms', query, analysis_prompt,
+                system_prompt=_SYMPTOM_SYSTEM,
+                temperature=0.2  # Low temperature for medical accuracy
+            )
+            
+            return _DISCLAIMER_PREFIX + response
+            
+        except Exception as e:
+            logger.error(f"Error in symptom analysis: {e}")
+            return _DISCLAIMER_PREFIX + "I apologize, but I encountered an error while analyzing the symptoms. Please consult with a healthcare professional for proper medical evaluation."
+    
+    def medication_analysis(self, query: str) -> str:
+        """Analyze medications, interactions, and pharmaceutical information"""
+        try:
+            medications = self._extract_medications(query)
+            
+            medication_prompt = f"Query: {query}\nIdentified Medications: {medications}"
+
+            response = self._cached_completion(
+                'medications', query, medication_prompt,
+                system_prompt=_MEDICATION_SYSTEM,
+                temperature=0.1  # Very low temperature for pharmaceutical accuracy
+            )
+            
+            return _DISCLAIMER_PREFIX + response
+            
+        except Exception as e:
+            logger.error(f"Error in medication analysis: {e}")
+            return _DISCLAIMER_PREFIX + "I apologize, but I encountered an error while analyzing the medication information. Please consult with your pharmacist or healthcare provider."
+    
+    def insurance_navigation(self, query: str) -> str:
+        """Help navigate healthcare insurance and coverage issues"""
+        try:
+            insurance_prompt = f"Query: {query}"
+
+            response = self._cached_completion(
+                'insurance', query, insurance_prompt,
+                system_prompt=_INSURANCE_SYSTEM,
                 temperature=0.3
             )
             
-            return f"{self.medical_disclaimer}\n\n{response}"
+            return response
+            
+        except Exception as e:
+            logger.error(f"Error in insurance navigation: {e}")
+            return "I apologize, but I encountered an error while providing insurance navigation guidance. Please contact your insurance provider directly or speak with a healthcare advocate."
+    
+    def wellness_coaching(self, query: str) -> str:
+        """Provide wellness and lifestyle coaching"""
+        try:
+            wellness_prompt = f"Query: {query}"
+
+            response = self._cached_completion(
+                'wellness', query, wellness_prompt,
+                system_prompt=_WELLNESS_SYSTEM,
+                temperature=0.4
+            )
+            
+            return response
+            
+        except Exception as e:
+            logger.error(f"Error in wellness coaching: {e}")
+            return "I apologize, but I encountered an error while providing wellness guidance. Please consult with a certified wellness coach or healthcare provider."
+    
+    def general_health_advice(self, query: str) -> str:
+        """Provide general health information and guidance"""
+        try:
+            health_prompt = f"Query: {query}"
+
+            response = self._cached_completion(
+                'general', query, health_prompt,
+                system_prompt=_HEALTH_ADVICE_SYSTEM,
+                temperature=0.3
+            )
+            
+            return _DISCLAIMER_PREFIX + response
             
         except Exception as e:
             logger.error(f"Error in general health advice: {e}")
-            return f"{self.medical_disclaimer}\n\nI apologize, but I encountered an error while providing health information. Please consult with a healthcare professional."
+            return _DISCLAIMER_PREFIX + "I apologize, but I encountered an error while providing health information. Please consult with a healthcare professional."
     
+    # Async entry points: each analysis blocks on an LLM round trip of
+    # several seconds, so async callers offload to a worker thread and
+    # keep their event loop free to interleave other requests
+    async def aanalyze_symptoms(self, query: str) -> str:
+        """Async wrapper around analyze_symptoms"""
+        return await asyncio.to_thread(self.analyze_symptoms, query)
+
+    async def amedication_analysis(self, query: str) -> str:
+        """Async wrapper around medication_analysis"""
+        return await asyncio.to_thread(self.medication_analysis, query)
+
+    async def ainsurance_navigation(self, query: str) -> str:
+        """Async wrapper around insurance_navigation"""
+        return await asyncio.to_thread(self.insurance_navigation, query)
+
+    async def awellness_coaching(self, query: str) -> str:
+        """Async wrapper around wellness_coaching"""
+        return await asyncio.to_thread(self.wellness_coaching, query)
+
+    async def ageneral_health_advice(self, query: str) -> str:
+        """Async wrapper around general_health_advice"""
+        return await asyncio.to_thread(self.general_health_advice, query)
+
     def _extract_symptoms(self, text: str) -> List[str]:
         """Extract potential symptoms from text"""
-        # Common symptom keywords
-        symptom_keywords = [
-            'pain', 'ache', 'hurt', 'sore', 'tender', 'swollen', 'fever', 'chills',
-            'nausea', 'vomiting', 'diarrhea', 'constipation', 'headache', 'dizzy',
-            'fatigue', 'tired', 'weakness', 'shortness of breath', 'cough', 'chest pain',
-            'abdominal pain', 'back pain', 'joint pain', 'muscle pain', 'rash', 'itchy',
-            'burning', 'stinging', 'cramping', 'bloating', 'heartburn', 'indigestion',
-            'congestion', 'runny nose', 'sneezing', 'watery eyes', 'blurred vision',
-            'ringing ears', 'hearing loss', 'difficulty swallowing', 'hoarse voice'
-        ]
-        
-        text_lower = text.lower()
-        found_symptoms = []
-        
-        for symptom in symptom_keywords:
-            if symptom in text_lower:
-                found_symptoms.append(symptom)
-        
-        return found_symptoms
-    
+        text_lower = _fold(text)
+        tokens = set(_TOKEN_RE.findall(text_lower))
+        found = sorted(tokens & _SYMPTOM_SINGLE)
+        found.extend(k for k in _SYMPTOM_MULTI if k in text_lower)
+        return found
+
     def _extract_medications(self, text: str) -> List[str]:
         """Extract potential medication names from text"""
         # This is a simplified implementation
         # In a real system, you'd use a comprehensive drug database
-        
-        # Common medication patterns and examples
-        medication_patterns = [
-            r'\b\w+mycin\b',  # Antibiotics like amoxicillin
-            r'\b\w+pril\b',   # ACE inhibitors like lisinopril
-            r'\b\w+olol\b',   # Beta blockers like metoprolol
-            r'\b\w+statin\b', # Statins like atorvastatin
-        ]
-        
-        # Common generic drug names
-        common_drugs = [
-            'aspirin', 'ibuprofen', 'acetaminophen', 'tylenol', 'advil', 'aleve',
-            'metformin', 'insulin', 'lisinopril', 'amlodipine', 'metoprolol',
-            'atorvastatin', 'simvastatin', 'levothyroxine', 'omeprazole',
-            'prednisone', 'albuterol', 'warfarin', 'clopidogrel', 'gabapentin'
-        ]
-        
-        text_lower = text.lower()
-        found_medications = []
-        
-        # Check for common drugs
-        for drug in common_drugs:
-            if drug in text_lower:
-                found_medications.append(drug)
-        
-        # Check for pattern matches
-        import re
-        for pattern in medication_patterns:
-            matches = re.findall(pattern, text_lower)
-            found_medications.extend(matches)
-        
-        return list(set(found_medications))  # Remove duplicates
+        text_lower = _fold(text)
+        tokens = set(_TOKEN_RE.findall(text_lower))
+        found_medications = sorted(tokens & _DRUG_SET)
+        found_medications.extend(m.lower() for m in _MED_SUFFIX_RE.findall(text))
+
+        # Remove duplicates, preserving first-seen order
+        return list(dict.fromkeys(found_medications))
     
+    def scan_clinical_notes(self, texts: List[str]) -> List[Dict]:
+        """Extract symptoms and medications from a batch of free-text notes.
+
+        Each note is lowered and tokenized exactly once and both keyword
+        tables are resolved against that single token set, so bulk
+        scanning costs one pass per note instead of one per extractor.
+        """
+        results = []
+        for text in texts:
+            text_lower = _fold(text)
+            tokens = set(_TOKEN_RE.findall(text_lower))
+
+            symptoms = sorted(tokens & _SYMPTOM_SINGLE)
+            symptoms.extend(k for k in _SYMPTOM_MULTI if k in text_lower)
+
+            medications = sorted(tokens & _DRUG_SET)
+            medications.extend(m.lower() for m in _MED_SUFFIX_RE.findall(text))
+
+            results.append({
+                'symptoms': symptoms,
+                'medications': list(dict.fromkeys(medications))
+            })
+        return results
+
     def get_health_resources(self) -> Dict:
         """Get healthcare resources and emergency information"""
-        return {
-            'emergency': {
-                'number': '911',
-                'poison_control': '1-800-222-1222',
-                'suicide_prevention': '988',
-                'crisis_text_line': 'Text HOME to 741741'
-            },
-            'resources': {
-                'cdc': 'https://www.cdc.gov',
-                'nih': 'https://www.nih.gov',
-                'mayo_clinic': 'https://www.mayoclinic.org',
-                'webmd': 'https://www.webmd.com',
-                'medline_plus': 'https://medlineplus.gov'
-            },
-            'professional_help': {
-                'find_doctor': 'Contact your insurance provider or visit healthcare.gov',
-                'mental_health': 'Psychology Today, NAMI, or your EAP program',
-                'specialists': 'Ask for referrals from your primary care physician'
-            }
-        }
+        return _HEALTH_RESOURCES
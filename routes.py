@@ -2,38 +2,152 @@
 Main application routes for the OperatorOS web interface
 """
 
-from flask import render_template, request, redirect, url_for, flash, session, jsonify
+from flask import render_template, request, redirect, url_for, flash, session, jsonify, Response
 from app import app, db
 from models import TaskRequest, AgentInstance, UserSession, SystemMetrics
 from agent_master_controller import get_master_controller
+from sqlalchemy import func, case
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+import json
 import logging
+import os
+import threading
+import time
 from datetime import datetime, timedelta
+from types import MappingProxyType
+from timeutils import iso_now
 
 logger = logging.getLogger(__name__)
 
+# Optional shared cache: with multiple gunicorn workers an in-process
+# TTL still recomputes once per worker, so when REDIS_URL is set the
+# aggregates are shared across workers; otherwise everything falls
+# back to the in-process memo below
+try:
+    import redis as _redis_lib
+except ImportError:
+    _redis_lib = None
+
+_redis = None
+if _redis_lib is not None and os.environ.get('REDIS_URL'):
+    try:
+        _redis = _redis_lib.Redis.from_url(
+            os.environ['REDIS_URL'], socket_timeout=0.25
+        )
+    except Exception as e:
+        logger.warning("Redis cache unavailable, using in-process cache: %s", e)
+        _redis = None
+
+POOLS = ('healthcare', 'financial', 'sports', 'business', 'general')
+
+# Small in-process TTL cache for the dashboard rollups: under
+# sustained polling the expensive status aggregation runs at most
+# once per window instead of once per request
+_ttl_cache = {}
+_ttl_lock = threading.Lock()
+
+def _ttl_cached(key, ttl, compute):
+    now = time.monotonic()
+    with _ttl_lock:
+        entry = _ttl_cache.get(key)
+        if entry is not None and now - entry[0] < ttl:
+            return entry[1]
+    value = compute()
+    with _ttl_lock:
+        _ttl_cache[key] = (now, value)
+    return value
+
+def _shared_cached(key, ttl, compute):
+    """TTL cache that prefers Redis (shared across workers) and falls
+    back to the in-process memo. Values must be JSON-serializable."""
+    if _redis is None:
+        return _ttl_cached(key, ttl, compute)
+    try:
+        raw = _redis.get(key)
+        if raw is not None:
+            return json.loads(raw)
+    except Exception as e:
+        logger.debug("Redis get failed for %s: %s", key, e)
+        return _ttl_cached(key, ttl, compute)
+    value = compute()
+    try:
+        _redis.setex(key, ttl, json.dumps(value))
+    except Exception as e:
+        logger.debug("Redis set failed for %s: %s", key, e)
+    return value
+
+def _invalidate_aggregates():
+    """Drop cached rollups after a state change so dashboards refresh"""
+    with _ttl_lock:
+        _ttl_cache.pop('ops:agg:status', None)
+        _ttl_cache.pop('ops:agg:pools', None)
+    if _redis is not None:
+        try:
+            _redis.delete('ops:agg:status', 'ops:agg:pools')
+        except Exception as e:
+            logger.debug("Redis invalidation failed: %s", e)
+
+def _empty_pool_stats():
+    return {'total': 0, 'active': 0, 'idle': 0, 'busy': 0, 'failed': 0}
+
+class Pagination:
+    """Minimal pagination container for templates
+
+    Defined once at module scope so task_monitor does not re-execute
+    the class statement on every request. Built from a window-function
+    total rather than flask_sqlalchemy's paginate(), which would issue
+    a second COUNT query.
+    """
+
+    __slots__ = ('items', 'page', 'per_page', 'total', 'pages',
+                 'has_prev', 'has_next', 'prev_num', 'next_num')
+
+    def __init__(self, items, page, per_page, total):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.pages = (total + per_page - 1) // per_page
+        self.has_prev = page > 1
+        self.has_next = page < self.pages
+        self.prev_num = page - 1 if self.has_prev else None
+        self.next_num = page + 1 if self.has_next else None
+
 @app.route('/')
 def index():
     """Main dashboard page"""
-    # Get system status
-    system_status = get_master_controller().get_system_status()
-    
-    # Get recent tasks
-    recent_tasks = db.session.query(TaskRequest).order_by(
+    # Get system status (10s TTL - tolerable staleness for a dashboard)
+    system_status = _shared_cached(
+        'ops:agg:status', 10,
+        lambda: get_master_controller().get_system_status()
+    )
+
+    # Get recent tasks; the template reads task.agent per row, so
+    # prefetch all agents with one follow-up IN query instead of one
+    # lazy SELECT per task
+    recent_tasks = db.session.query(TaskRequest).options(
+        selectinload(TaskRequest.agent)
+    ).order_by(
         TaskRequest.created_at.desc()
     ).limit(5).all()
     
-    # Get agent pool statistics
-    agent_pools = {}
-    for pool_name in ['healthcare', 'financial', 'sports', 'business', 'general']:
-        agents = db.session.query(AgentInstance).filter_by(pool_name=pool_name).all()
-        agent_pools[pool_name] = {
-            'total': len(agents),
-            'active': len([a for a in agents if a.status in ['idle', 'busy']]),
-            'idle': len([a for a in agents if a.status == 'idle']),
-            'busy': len([a for a in agents if a.status == 'busy']),
-            'failed': len([a for a in agents if a.status == 'failed'])
-        }
-    
+    # Get agent pool statistics from one aggregated query instead of
+    # hydrating every agent row per pool
+    rows = _shared_cached('ops:agg:pools', 10, lambda: [
+        list(row) for row in db.session.query(
+            AgentInstance.pool_name, AgentInstance.status, func.count()
+        ).group_by(AgentInstance.pool_name, AgentInstance.status).all()
+    ])
+
+    agent_pools = {pool_name: _empty_pool_stats() for pool_name in POOLS}
+    for pool_name, status, count in rows:
+        stats = agent_pools.setdefault(pool_name, _empty_pool_stats())
+        stats['total'] += count
+        if status in ('idle', 'busy'):
+            stats['active'] += count
+        if status in stats:
+            stats[status] += count
+
     return render_template('index.html', 
                          system_status=system_status,
                          recent_tasks=recent_tasks,
@@ -42,37 +156,53 @@ def index():
 @app.route('/dashboard')
 def dashboard():
     """System dashboard with metrics"""
-    # Get recent metrics
-    recent_metrics = db.session.query(SystemMetrics).order_by(
+    # Get recent metrics; the template only reads these three columns,
+    # so skip full-row ORM hydration
+    recent_metrics = db.session.query(SystemMetrics).with_entities(
+        SystemMetrics.timestamp,
+        SystemMetrics.successful_requests,
+        SystemMetrics.failed_requests
+    ).order_by(
         SystemMetrics.timestamp.desc()
     ).limit(20).all()
     
-    # Get task statistics
-    total_tasks = db.session.query(TaskRequest).count()
-    completed_tasks = db.session.query(TaskRequest).filter_by(status='completed').count()
-    failed_tasks = db.session.query(TaskRequest).filter_by(status='failed').count()
-    pending_tasks = db.session.query(TaskRequest).filter_by(status='pending').count()
-    
-    # Get agent statistics
-    agents = db.session.query(AgentInstance).all()
+    # Get task statistics: one conditionally-aggregated query instead
+    # of four COUNT round trips
+    task_row = db.session.query(
+        func.count().label('total'),
+        func.sum(case((TaskRequest.status == 'completed', 1), else_=0)).label('completed'),
+        func.sum(case((TaskRequest.status == 'failed', 1), else_=0)).label('failed'),
+        func.sum(case((TaskRequest.status == 'pending', 1), else_=0)).label('pending'),
+    ).one()
+    total_tasks = task_row.total or 0
+    completed_tasks = task_row.completed or 0
+
+    # Get agent statistics the same way, without hydrating every row
+    agent_row = db.session.query(
+        func.count().label('total'),
+        func.sum(case((AgentInstance.status.in_(('idle', 'busy')), 1), else_=0)).label('active'),
+        func.sum(case((AgentInstance.status == 'idle', 1), else_=0)).label('idle'),
+        func.sum(case((AgentInstance.status == 'busy', 1), else_=0)).label('busy'),
+        func.sum(case((AgentInstance.status == 'failed', 1), else_=0)).label('failed'),
+    ).one()
     agent_stats = {
-        'total': len(agents),
-        'active': len([a for a in agents if a.status in ['idle', 'busy']]),
-        'idle': len([a for a in agents if a.status == 'idle']),
-        'busy': len([a for a in agents if a.status == 'busy']),
-        'failed': len([a for a in agents if a.status == 'failed'])
+        'total': agent_row.total or 0,
+        'active': agent_row.active or 0,
+        'idle': agent_row.idle or 0,
+        'busy': agent_row.busy or 0,
+        'failed': agent_row.failed or 0
     }
-    
+
     # Calculate success rate
     success_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-    
+
     return render_template('dashboard.html',
                          recent_metrics=recent_metrics,
                          task_stats={
                              'total': total_tasks,
                              'completed': completed_tasks,
-                             'failed': failed_tasks,
-                             'pending': pending_tasks,
+                             'failed': task_row.failed or 0,
+                             'pending': task_row.pending or 0,
                              'success_rate': success_rate
                          },
                          agent_stats=agent_stats)
@@ -80,19 +210,20 @@ def dashboard():
 @app.route('/agent-pools')
 def agent_pools():
     """Agent pools management page"""
-    pools = {}
-    
-    for pool_name in ['healthcare', 'financial', 'sports', 'business', 'general']:
-        agents = db.session.query(AgentInstance).filter_by(pool_name=pool_name).all()
-        pools[pool_name] = {
-            'agents': agents,
-            'total': len(agents),
-            'active': len([a for a in agents if a.status in ['idle', 'busy']]),
-            'idle': len([a for a in agents if a.status == 'idle']),
-            'busy': len([a for a in agents if a.status == 'busy']),
-            'failed': len([a for a in agents if a.status == 'failed'])
-        }
-    
+    # The page renders every agent anyway, so load them once and build
+    # the per-pool stats in a single pass instead of five filtered
+    # queries with repeated list comprehensions
+    pools = {pool_name: dict(_empty_pool_stats(), agents=[]) for pool_name in POOLS}
+
+    for agent in db.session.query(AgentInstance).order_by(AgentInstance.pool_name).all():
+        stats = pools.setdefault(agent.pool_name, dict(_empty_pool_stats(), agents=[]))
+        stats['agents'].append(agent)
+        stats['total'] += 1
+        if agent.status in ('idle', 'busy'):
+            stats['active'] += 1
+        if agent.status in stats:
+            stats[agent.status] += 1
+
     return render_template('agent_pools.html', pools=pools)
 
 @app.route('/submit-task', methods=['GET', 'POST'])
@@ -112,7 +243,8 @@ def submit_task():
                 query=query,
                 priority=priority
             )
-            
+            _invalidate_aggregates()
+
             flash(f'Task submitted successfully! Task ID: {task_id}', 'success')
             return redirect(url_for('task_status', task_id=task_id))
         
@@ -125,18 +257,16 @@ def submit_task():
 @app.route('/task/<task_id>')
 def task_status(task_id):
     """View task status and results"""
-    task = db.session.query(TaskRequest).filter_by(task_id=task_id).first()
-    
+    task = db.session.query(TaskRequest).options(
+        joinedload(TaskRequest.agent), raiseload('*')
+    ).filter_by(task_id=task_id).first()
+
     if not task:
         flash('Task not found', 'error')
         return redirect(url_for('index'))
-    
-    # Get agent info if assigned
-    agent = None
-    if task.agent_id:
-        agent = db.session.query(AgentInstance).get(task.agent_id)
-    
-    return render_template('task_status.html', task=task, agent=agent)
+
+    # Agent arrives in the same query via the joined load
+    return render_template('task_status.html', task=task, agent=task.agent)
 
 @app.route('/tasks')
 def task_monitor():
@@ -145,9 +275,13 @@ def task_monitor():
     status_filter = request.args.get('status', 'all')
     pool_filter = request.args.get('pool', 'all')
     
-    # Build query
-    query = db.session.query(TaskRequest)
-    
+    # Build query; eager-load each task's agent so template access to
+    # task.agent does not issue one SELECT per row, and raise on any
+    # other relationship access so hidden N+1s surface immediately
+    query = db.session.query(TaskRequest).options(
+        joinedload(TaskRequest.agent), raiseload('*')
+    )
+
     if status_filter != 'all':
         query = query.filter_by(status=status_filter)
     
@@ -156,24 +290,16 @@ def task_monitor():
             AgentInstance.pool_name == pool_filter
         )
     
-    # Get tasks with pagination
+    # Get tasks with pagination; a window count returns the filtered
+    # total alongside the page rows, avoiding a second query that
+    # would re-run the same filter and join
     page = request.args.get('page', 1, type=int)
     per_page = 20
-    tasks_list = query.order_by(TaskRequest.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
-    total = query.count()
-    
-    # Create pagination object manually
-    class Pagination:
-        def __init__(self, items, page, per_page, total):
-            self.items = items
-            self.page = page
-            self.per_page = per_page
-            self.total = total
-            self.pages = (total + per_page - 1) // per_page
-            self.has_prev = page > 1
-            self.has_next = page < self.pages
-            self.prev_num = page - 1 if self.has_prev else None
-            self.next_num = page + 1 if self.has_next else None
+    rows = query.add_columns(
+        func.count().over().label('total')
+    ).order_by(TaskRequest.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
+    tasks_list = [row[0] for row in rows]
+    total = rows[0].total if rows else 0
     
     tasks = Pagination(tasks_list, page, per_page, total)
     
@@ -185,131 +311,197 @@ def task_monitor():
 @app.route('/sessions')
 def sessions():
     """User sessions management"""
-    user_sessions = db.session.query(UserSession).filter_by(is_active=True).order_by(
+    # The template renders each session's user and tasks, so eager-load
+    # both and cap the result set instead of hydrating the whole table
+    user_sessions = db.session.query(UserSession).options(
+        joinedload(UserSession.user)
+    ).filter_by(is_active=True).order_by(
         UserSession.last_activity.desc()
-    ).all()
+    ).limit(200).all()
     
     return render_template('sessions.html', sessions=user_sessions)
 
+@app.route('/health/live')
+def health_live():
+    """Process liveness probe: no DB, no locks, no controller"""
+    return jsonify({'status': 'ok'})
+
 @app.route('/health')
+@app.route('/health/ready')
 def health_check():
-    """System health check endpoint"""
+    """System health check / readiness endpoint"""
     try:
-        # Check database
+        # Check database; a plain SELECT needs no commit
         from sqlalchemy import text
         db.session.execute(text('SELECT 1'))
-        db.session.commit()
-        
-        # Get system status
-        system_status = get_master_controller().get_system_status()
-        
+
+        # Get system status (cached - probes shouldn't recompute it)
+        system_status = _shared_cached(
+            'ops:agg:status', 10,
+            lambda: get_master_controller().get_system_status()
+        )
+
         return jsonify({
             'status': 'healthy',
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': iso_now(),
             'system_status': system_status
         })
-    
+
     except Exception as e:
         return jsonify({
             'status': 'unhealthy',
             'error': str(e),
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': iso_now()
         }), 500
 
+# Demo catalog: static content, so built once and frozen instead of
+# reallocating the nested dict/list structure on every pageview
+_DEMOS = MappingProxyType({
+    'healthcare': {
+        'title': 'Healthcare AI Assistant',
+        'description': 'Advanced medical analysis and healthcare guidance',
+        'examples': [
+            'Analyze symptoms for potential conditions',
+            'Medication interaction checking',
+            'Insurance coverage navigation',
+            'Wellness and lifestyle recommendations'
+        ]
+    },
+    'financial': {
+        'title': 'Financial AI Advisor',
+        'description': 'Comprehensive financial analysis and planning',
+        'examples': [
+            'Investment portfolio optimization',
+            'Market analysis and predictions',
+            'Debt consolidation strategies',
+            'Retirement planning guidance'
+        ]
+    },
+    'sports': {
+        'title': 'Sports Analytics Engine',
+        'description': 'Advanced sports analysis and betting insights',
+        'examples': [
+            'Game outcome predictions',
+            'Sports arbitrage opportunities',
+            'Fantasy sports optimization',
+            'Performance analytics'
+        ]
+    },
+    'business': {
+        'title': 'Business Automation Suite',
+        'description': 'Enterprise workflow optimization and automation',
+        'examples': [
+            'Process automation design',
+            'Workflow optimization',
+            'Project management assistance',
+            'Strategic planning support'
+        ]
+    }
+})
+
 @app.route('/demo/<demo_type>')
 def demo_showcase(demo_type):
     """Showcase different agent capabilities"""
-    demos = {
-        'healthcare': {
-            'title': 'Healthcare AI Assistant',
-            'description': 'Advanced medical analysis and healthcare guidance',
-            'examples': [
-                'Analyze symptoms for potential conditions',
-                'Medication interaction checking',
-                'Insurance coverage navigation',
-                'Wellness and lifestyle recommendations'
-            ]
-        },
-        'financial': {
-            'title': 'Financial AI Advisor',
-            'description': 'Comprehensive financial analysis and planning',
-            'examples': [
-                'Investment portfolio optimization',
-                'Market analysis and predictions',
-                'Debt consolidation strategies',
-                'Retirement planning guidance'
-            ]
-        },
-        'sports': {
-            'title': 'Sports Analytics Engine',
-            'description': 'Advanced sports analysis and betting insights',
-            'examples': [
-                'Game outcome predictions',
-                'Sports arbitrage opportunities',
-                'Fantasy sports optimization',
-                'Performance analytics'
-            ]
-        },
-        'business': {
-            'title': 'Business Automation Suite',
-            'description': 'Enterprise workflow optimization and automation',
-            'examples': [
-                'Process automation design',
-                'Workflow optimization',
-                'Project management assistance',
-                'Strategic planning support'
-            ]
-        }
-    }
-    
-    if demo_type not in demos:
+    if demo_type not in _DEMOS:
         flash('Demo type not found', 'error')
         return redirect(url_for('index'))
     
     return render_template('demo_showcase.html', 
-                         demo=demos[demo_type],
+                         demo=_DEMOS[demo_type],
                          demo_type=demo_type)
 
 @app.route('/api/submit', methods=['POST'])
 def simple_api_submit():
     """Simple API endpoint for task submission (no auth required)"""
+    # Parse the raw body directly (no request-object caching) and
+    # reject bad payloads before any controller or DB work
+    try:
+        data = json.loads(request.get_data(cache=False))
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid JSON body'}), 400
+
+    if not isinstance(data, dict) or not data.get('query'):
+        return jsonify({'error': 'Query is required'}), 400
+
     try:
-        data = request.get_json()
-        
-        if not data or 'query' not in data:
-            return jsonify({'error': 'Query is required'}), 400
-        
         task_id = get_master_controller().submit_task(
             query=data['query'],
             priority=data.get('priority', 5)
         )
-        
+        _invalidate_aggregates()
+
         return jsonify({
             'task_id': task_id,
             'status': 'submitted',
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': iso_now()
         })
     
     except Exception as e:
         logger.error(f"API task submission error: {e}")
         return jsonify({'error': str(e)}), 500
 
+_sports_analyzer = None
+_sports_analyzer_lock = threading.Lock()
+
+def _get_sports_analyzer():
+    """Lazily create the shared sports analyzer for streaming routes"""
+    global _sports_analyzer
+    if _sports_analyzer is None:
+        with _sports_analyzer_lock:
+            if _sports_analyzer is None:
+                from sports_betting import SportsBettingAnalyzer
+                from ai_providers import get_ai_provider_manager
+                _sports_analyzer = SportsBettingAnalyzer(get_ai_provider_manager())
+    return _sports_analyzer
+
+@app.route('/api/stream/betting', methods=['POST'])
+def stream_betting_analysis():
+    """Stream betting analysis as server-sent events
+
+    Chunks are flushed to the client as the provider generates them,
+    so time-to-first-byte is first-token latency instead of the full
+    generation time.
+    """
+    data = request.get_json(silent=True)
+
+    if not data or 'query' not in data:
+        return jsonify({'error': 'Query is required'}), 400
+
+    analyzer = _get_sports_analyzer()
+
+    def generate():
+        for chunk in analyzer.betting_analysis_stream(data['query']):
+            yield f"data: {json.dumps({'text': chunk})}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return Response(generate(), mimetype='text/event-stream')
+
 @app.route('/api/status/<task_id>')
 def simple_api_task_status(task_id):
     """Simple API endpoint for task status"""
-    task = db.session.query(TaskRequest).filter_by(task_id=task_id).first()
-    
-    if not task:
+    # Fetch only the serialized columns: a single index seek on
+    # task_id with no ORM mapper hydration
+    row = db.session.query(
+        TaskRequest.task_id,
+        TaskRequest.status,
+        TaskRequest.result,
+        TaskRequest.error_message,
+        TaskRequest.created_at,
+        TaskRequest.completed_at,
+        TaskRequest.processing_time
+    ).filter_by(task_id=task_id).first()
+
+    if not row:
         return jsonify({'error': 'Task not found'}), 404
-    
+
     return jsonify({
-        'task_id': task.task_id,
-        'status': task.status,
-        'result': task.result,
-        'error_message': task.error_message,
-        'created_at': task.created_at.isoformat(),
-        'completed_at': task.completed_at.isoformat() if task.completed_at else None,
-        'processing_time': task.processing_time
+        'task_id': row.task_id,
+        'status': row.status,
+        'result': row.result,
+        'error_message': row.error_message,
+        'created_at': row.created_at.isoformat(),
+        'completed_at': row.completed_at.isoformat() if row.completed_at else None,
+        'processing_time': row.processing_time
     })
 
 # Initialize the master controller when the app starts
@@ -321,6 +513,18 @@ def initialize_system():
     except Exception as e:
         logger.error(f"Failed to initialize system: {e}")
 
-# Initialize system when module is imported
-with app.app_context():
-    initialize_system()
+# Start the controller lazily on the first request in each worker
+# rather than at import time: under gunicorn's preload-fork model an
+# import-time start would spawn background threads in the master
+# process that do not survive fork cleanly
+_initialized = False
+_init_lock = threading.Lock()
+
+@app.before_request
+def _ensure_initialized():
+    global _initialized
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                initialize_system()
+                _initialized = True
@@ -3,126 +3,429 @@ Task Processor - Handles task execution and queue management
 Priority-based task queuing with load balancing
 """
 
+import asyncio
+import heapq
 import logging
 import time
 import threading
+from collections import Counter, OrderedDict
 from datetime import datetime
+from types import MappingProxyType
 from typing import Dict, List, Optional
-from concurrent.futures import ThreadPoolExecutor
-import queue
+
+from sqlalchemy import case, text, update
 
 from app import db
 from models import TaskRequest, AgentInstance
 
 logger = logging.getLogger(__name__)
 
+# Capability -> pool routing map, built once at import and frozen;
+# per-task routing is dict lookups against it, no Python loop over
+# pool definitions
+CAPABILITY_POOL_MAP = MappingProxyType({
+    'medical_diagnosis': 'healthcare',
+    'pharmacology_analysis': 'healthcare',
+    'insurance_navigation': 'healthcare',
+    'healthcare_finance': 'healthcare',
+    'wellness_coaching': 'healthcare',
+    'clinical_decision_support': 'healthcare',
+    'wealth_optimization': 'financial',
+    'debt_elimination': 'financial',
+    'tax_strategy': 'financial',
+    'retirement_planning': 'financial',
+    'business_finance': 'financial',
+    'market_intelligence': 'financial',
+    'sports_prediction': 'sports',
+    'market_education': 'sports',
+    'fantasy_sports': 'sports',
+    'compliance_monitoring': 'sports',
+    'sports_content': 'sports',
+    'analytics': 'sports',
+    'process_automation': 'business',
+    'workflow_optimization': 'business',
+    'project_management': 'business',
+    'team_coordination': 'business',
+    'strategic_planning': 'business',
+    'operations': 'business'
+})
+
+def _target_pool(required_capabilities) -> str:
+    """Pick the pool matching the most required capabilities
+
+    First-hit routing sent a task asking for both medical_diagnosis
+    and tax_strategy to whichever pool happened to match first;
+    Counter scoring routes it to the pool covering the most of the
+    request, in two C-level calls.
+    """
+    if not required_capabilities:
+        return 'general'
+    scores = Counter(
+        CAPABILITY_POOL_MAP.get(capability, 'general')
+        for capability in required_capabilities
+    )
+    return scores.most_common(1)[0][0]
+
+# Workers drain up to this many queued tasks at once so the batch can
+# be loaded with a single IN() query
+_PREFETCH_MAX = 32
+
+# Atomic agent reservation: the database picks the best candidate and
+# increments its load in one statement, so two workers can never grab
+# the same capacity slot. SKIP LOCKED makes racing workers move on to
+# the next candidate instead of queueing on the row lock.
+_RESERVE_AGENT_SQL = text("""
+    UPDATE agent_instance
+    SET current_load = current_load + 1, status = 'busy'
+    WHERE id = (
+        SELECT id FROM agent_instance
+        WHERE pool_name = :pool
+          AND status = 'idle'
+          AND current_load < max_capacity
+        ORDER BY current_load, success_rate DESC
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id
+""")
+
 class TaskProcessor:
     """Handles task processing and queue management"""
-    
+
     def __init__(self, max_workers=20):
         self.max_workers = max_workers
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
-        self.task_queue = queue.PriorityQueue()
         self.running = False
-        self.processing_stats = {
-            'total_processed': 0,
-            'successful': 0,
-            'failed': 0,
-            'avg_processing_time': 0.0
-        }
-        
+        # Per-worker priority heaps instead of one shared
+        # PriorityQueue: submissions round-robin across workers, so
+        # the hot path contends on 1/N of the locking a single shared
+        # mutex would see. Each worker drains its own heap first and
+        # steals from its neighbours when empty.
+        self.worker_queues = [[] for _ in range(max_workers)]
+        self.worker_locks = [threading.Lock() for _ in range(max_workers)]
+        self._rr = 0
+        self._rr_lock = threading.Lock()
+        self._worker_threads = []
+        # Submission wakeup: idle workers block on this event instead
+        # of polling on a fixed timeout
+        self._not_empty = threading.Event()
+        # Backoff for the no-agent requeue path (doubles up to 100ms,
+        # resets as soon as an agent is found); the event is set every
+        # time an agent frees up, so a waiting worker retries the
+        # moment capacity appears instead of sleeping the interval out
+        self._requeue_backoff = 0.001
+        self._agent_available = threading.Event()
+        # Admission control: total queued tasks are bounded so a burst
+        # sheds work at the door instead of buffering unbounded task
+        # tuples in memory. Requeues bypass the bound — those tasks
+        # were already admitted and must not be lost.
+        self._queue_bound = max_workers * 100
+        self._shed_count = 0
+        self._queue_high_water = 0
+        # In-memory index of available agents per pool, refreshed
+        # every second; agent availability changes on the order of
+        # seconds, so most lookups become a dict read instead of an
+        # ordered SELECT per task
+        self._agent_index = {}
+        self._agent_index_lock = threading.Lock()
+        # pool_name -> handler table, built lazily on first task
+        self._dispatch = None
+        # Status cache for polling clients: terminal results are
+        # immutable so they cache forever, in-flight statuses for 60s
+        self._status_cache = OrderedDict()
+        self._status_cache_lock = threading.Lock()
+        self._status_cache_max = 10000
+        self._status_cache_ttl = 60.0
+        # Structure-of-arrays stats: each worker mutates only its own
+        # slot (indexed via a thread-local), so counters need no lock
+        # and no cross-worker cache-line traffic; reads sum the slots
+        self._per_worker_stats = [
+            {'total': 0, 'successful': 0, 'failed': 0, 'time_sum': 0.0}
+            for _ in range(max_workers)
+        ]
+        self._worker_slot = threading.local()
+
     def start(self):
         """Start the task processor"""
         if self.running:
             return
-        
+
         self.running = True
-        self._start_queue_processor()
+        self._start_workers()
+        threading.Thread(target=self._refresh_agent_index, daemon=True).start()
+        threading.Thread(target=self._check_pool_health, daemon=True).start()
         logger.info("Task processor started")
-    
+
     def stop(self):
         """Stop the task processor"""
         self.running = False
-        self.executor.shutdown(wait=True)
+        for thread in self._worker_threads:
+            thread.join(timeout=5)
+        self._worker_threads = []
         logger.info("Task processor stopped")
-    
-    def submit_task(self, task_id: str, priority: int = 5):
-        """Submit a task to the processing queue"""
+
+    def submit_task(self, task_id: str, priority: int = 5) -> bool:
+        """Submit a task to the processing queue
+
+        Returns False when the queues are at the bound and the task
+        was shed; the task row stays pending in the database, so a
+        caller can resubmit once the burst drains.
+        """
+        depth = sum(len(task_heap) for task_heap in self.worker_queues)
+        if depth >= self._queue_bound:
+            with self._rr_lock:
+                self._shed_count += 1
+            logger.warning(
+                f"Task {task_id} shed: queue depth {depth} at bound {self._queue_bound}"
+            )
+            return False
+        self._enqueue(task_id, priority)
+        return True
+
+    def _enqueue(self, task_id: str, priority: int):
+        """Push a task onto the next round-robin worker heap"""
         timestamp = time.time()
-        self.task_queue.put((priority, timestamp, task_id))
+        with self._rr_lock:
+            self._rr = (self._rr + 1) % self.max_workers
+            index = self._rr
+            depth = sum(len(task_heap) for task_heap in self.worker_queues) + 1
+            if depth > self._queue_high_water:
+                self._queue_high_water = depth
+        with self.worker_locks[index]:
+            heapq.heappush(self.worker_queues[index], (priority, timestamp, task_id))
+        self._not_empty.set()
         logger.debug(f"Task {task_id} submitted with priority {priority}")
-    
-    def _start_queue_processor(self):
-        """Start the queue processing thread"""
-        def process_queue():
-            while self.running:
-                try:
-                    # Get task from queue with timeout
-                    priority, timestamp, task_id = self.task_queue.get(timeout=1.0)
-                    
-                    # Submit task for processing
-                    self.executor.submit(self._process_single_task, task_id)
-                    
-                except queue.Empty:
+
+    def _start_workers(self):
+        """Start one dedicated worker thread per queue"""
+        for index in range(self.max_workers):
+            thread = threading.Thread(
+                target=self._worker_loop, args=(index,), daemon=True
+            )
+            thread.start()
+            self._worker_threads.append(thread)
+
+    def _worker_loop(self, index: int):
+        """Drain the worker's own queue, stealing from others when empty
+
+        An idle worker waits on the submission event with an
+        exponentially growing timeout (1ms up to 50ms) instead of
+        polling at a fixed interval: pickup latency stays in the
+        low milliseconds while idle CPU goes to ~zero. A submission
+        racing the clear() is at worst picked up on the next timeout.
+        """
+        self._worker_slot.index = index
+        backoff = 0.001
+        while self.running:
+            try:
+                items = self._drain_tasks(index, _PREFETCH_MAX)
+                if not items:
+                    self._not_empty.wait(timeout=backoff)
+                    self._not_empty.clear()
+                    backoff = min(backoff * 2, 0.05)
                     continue
-                except Exception as e:
-                    logger.error(f"Error in queue processor: {e}")
-        
-        threading.Thread(target=process_queue, daemon=True).start()
-    
-    def _process_single_task(self, task_id: str):
-        """Process a single task"""
+                backoff = 0.001
+                # One IN() load for the whole drained batch instead of
+                # a SELECT per task
+                task_ids = [item[2] for item in items]
+                prefetched = {}
+                if len(task_ids) > 1:
+                    try:
+                        rows = TaskRequest.query.filter(
+                            TaskRequest.task_id.in_(task_ids)
+                        ).all()
+                        prefetched = {row.task_id: row for row in rows}
+                    except Exception as e:
+                        logger.debug(f"Task prefetch failed: {e}")
+                        prefetched = {}
+                for task_id in task_ids:
+                    self._process_single_task(task_id, prefetched.get(task_id))
+            except Exception as e:
+                logger.error(f"Error in worker {index}: {e}")
+
+    def _drain_tasks(self, index: int, limit: int) -> List:
+        """Pop up to limit tasks from this worker's own queue
+
+        The batch never reaches into other workers' heaps: tasks are
+        processed serially after the drain, so bulk-stealing would
+        pull work away from workers that could run it in parallel.
+        Stealing happens one task at a time, and only when the own
+        queue is empty.
+        """
+        items = []
+        with self.worker_locks[index]:
+            task_heap = self.worker_queues[index]
+            while task_heap and len(items) < limit:
+                items.append(heapq.heappop(task_heap))
+        if not items:
+            item = self._steal_task(index)
+            if item is not None:
+                items.append(item)
+        return items
+
+    def _refresh_agent_index(self):
+        """Rebuild the per-pool availability index once a second"""
+        while self.running:
+            try:
+                rows = db.session.query(
+                    AgentInstance.id,
+                    AgentInstance.pool_name,
+                    AgentInstance.current_load,
+                    AgentInstance.success_rate
+                ).filter(
+                    AgentInstance.status == 'idle',
+                    AgentInstance.current_load < AgentInstance.max_capacity
+                ).all()
+                db.session.rollback()
+
+                index = {}
+                for row in rows:
+                    index.setdefault(row.pool_name, []).append(
+                        (row.current_load, -(row.success_rate or 0.0), row.id)
+                    )
+                for candidates in index.values():
+                    candidates.sort()
+
+                with self._agent_index_lock:
+                    self._agent_index = index
+            except Exception as e:
+                logger.debug(f"Agent index refresh failed: {e}")
+            time.sleep(1)
+
+    def _agent_from_index(self, pool_name: str) -> Optional[AgentInstance]:
+        """Pick the least-loaded indexed agent, verifying against the DB
+
+        The index can be up to a second stale, so each candidate is
+        re-checked with a primary-key get before being handed out.
+        """
+        with self._agent_index_lock:
+            candidates = list(self._agent_index.get(pool_name, ()))
+        for _load, _neg_rate, agent_id in candidates:
+            agent = AgentInstance.query.get(agent_id)
+            if agent and agent.status == 'idle' and agent.current_load < agent.max_capacity:
+                return agent
+        return None
+
+    def _check_pool_health(self):
+        """Log connection pool status periodically
+
+        Lets operators compare checked-out connections against
+        max_workers and spot checkout contention before it shows up
+        as latency.
+        """
+        while self.running:
+            try:
+                logger.info(f"DB pool status: {db.engine.pool.status()}")
+            except Exception as e:
+                logger.debug(f"Could not read pool status: {e}")
+            time.sleep(30)
+
+    def _steal_task(self, index: int):
+        """Steal one task from a neighbour's heap"""
+        for offset in range(1, self.max_workers):
+            target = (index + offset) % self.max_workers
+            task_heap = self.worker_queues[target]
+            # Unlocked emptiness peek is safe: a stale read just means
+            # we skip (or retry) a queue, never corrupt one
+            if not task_heap:
+                continue
+            with self.worker_locks[target]:
+                if task_heap:
+                    return heapq.heappop(task_heap)
+        return None
+
+    def _process_single_task(self, task_id: str, task: Optional[TaskRequest] = None):
+        """Process a single task, reusing a prefetched row if given"""
         start_time = time.time()
-        
+
         try:
-            # Get task from database
-            task = TaskRequest.query.filter_by(task_id=task_id).first()
+            # Get task from database unless the worker batch-loaded it
+            if task is None:
+                task = TaskRequest.query.filter_by(task_id=task_id).first()
             if not task:
                 logger.error(f"Task {task_id} not found in database")
                 return
             
-            # Find available agent
-            agent = self._find_available_agent(task.required_capabilities)
+            # Reserve an agent atomically
+            agent, reserved = self._reserve_agent(task.required_capabilities)
             if not agent:
-                # No agents available, requeue task
-                self.task_queue.put((task.priority, time.time(), task_id))
-                time.sleep(1)  # Wait before retrying
+                # No agents available: requeue, then wait for a
+                # free-up signal (or the backoff timeout, whichever
+                # comes first) before pulling the next task
+                self._enqueue(task_id, task.priority)
+                self._agent_available.wait(timeout=self._requeue_backoff)
+                self._agent_available.clear()
+                self._requeue_backoff = min(self._requeue_backoff * 2, 0.1)
                 return
-            
-            # Update task status
+            self._requeue_backoff = 0.001
+
+            # Mark the task processing; on Postgres the agent row was
+            # already claimed by the CAS statement, so only the
+            # fallback path still updates it here
+            agent_id = agent.id
             with db.session.begin():
-                task.status = 'processing'
-                task.agent_id = agent.id
-                agent.status = 'busy'
-                agent.current_load += 1
-            
+                db.session.execute(
+                    update(TaskRequest)
+                    .where(TaskRequest.task_id == task_id)
+                    .values(status='processing', agent_id=agent_id)
+                )
+                if not reserved:
+                    db.session.execute(
+                        update(AgentInstance)
+                        .where(AgentInstance.id == agent_id)
+                        .values(
+                            status='busy',
+                            current_load=AgentInstance.current_load + 1
+                        )
+                    )
+
+            self._invalidate_status(task_id)
+
             # Process the task
             result = self._execute_task(task, agent)
-            
-            # Update task with result
+
+            # Record the result with one UPDATE per table; counters
+            # and rolling averages are computed in-database, so two
+            # workers finishing at once cannot overlap on a stale read
             processing_time = time.time() - start_time
             with db.session.begin():
-                task.status = 'completed'
-                task.result = result
-                task.completed_at = datetime.utcnow()
-                task.processing_time = processing_time
-                
-                # Update agent stats
-                agent.total_tasks += 1
-                agent.successful_tasks += 1
-                agent.current_load -= 1
-                if agent.current_load == 0:
-                    agent.status = 'idle'
-                
-                # Update success rate
-                agent.success_rate = (agent.successful_tasks / agent.total_tasks) * 100
-                
-                # Update response time
-                agent.avg_response_time = (
-                    (agent.avg_response_time * (agent.total_tasks - 1) + processing_time) /
-                    agent.total_tasks
+                db.session.execute(
+                    update(TaskRequest)
+                    .where(TaskRequest.task_id == task_id)
+                    .values(
+                        status='completed',
+                        result=result,
+                        completed_at=datetime.utcnow(),
+                        processing_time=processing_time
+                    )
+                )
+                db.session.execute(
+                    update(AgentInstance)
+                    .where(AgentInstance.id == agent_id)
+                    .values(
+                        total_tasks=AgentInstance.total_tasks + 1,
+                        successful_tasks=AgentInstance.successful_tasks + 1,
+                        current_load=AgentInstance.current_load - 1,
+                        status=case(
+                            (AgentInstance.current_load - 1 <= 0, 'idle'),
+                            else_=AgentInstance.status
+                        ),
+                        success_rate=(
+                            (AgentInstance.successful_tasks + 1) * 100.0 /
+                            (AgentInstance.total_tasks + 1)
+                        ),
+                        avg_response_time=(
+                            (AgentInstance.avg_response_time * AgentInstance.total_tasks
+                             + processing_time) /
+                            (AgentInstance.total_tasks + 1)
+                        )
+                    )
                 )
             
+            self._invalidate_status(task_id)
+            # The agent's load just dropped; wake any worker backing
+            # off in the no-agent path
+            self._agent_available.set()
+
             # Update processing stats
             self._update_processing_stats(processing_time, True)
             logger.info(f"Task {task_id} completed in {processing_time:.2f}s")
@@ -133,72 +436,114 @@ class TaskProcessor:
             logger.error(f"Task {task_id} failed: {e}")
             
             try:
+                # Same in-database arithmetic as the success path: one
+                # UPDATE per table, no SELECT-then-assign on the agent.
+                # The agent lookup rides in the same transaction as the
+                # updates, so failure cleanup costs a single commit.
                 with db.session.begin():
-                    task = TaskRequest.query.filter_by(task_id=task_id).first()
-                    if task:
-                        task.status = 'failed'
-                        task.error_message = str(e)
-                        task.completed_at = datetime.utcnow()
-                        task.processing_time = processing_time
-                        
-                        # Update agent stats if agent was assigned
-                        if task.agent_id:
-                            agent = AgentInstance.query.get(task.agent_id)
-                            if agent:
-                                agent.total_tasks += 1
-                                agent.failed_tasks += 1
-                                agent.current_load -= 1
-                                if agent.current_load == 0:
-                                    agent.status = 'idle'
-                                
-                                # Update success rate
-                                agent.success_rate = (agent.successful_tasks / agent.total_tasks) * 100
-                
+                    failed_agent_id = db.session.query(
+                        TaskRequest.agent_id
+                    ).filter_by(task_id=task_id).scalar()
+                    db.session.execute(
+                        update(TaskRequest)
+                        .where(TaskRequest.task_id == task_id)
+                        .values(
+                            status='failed',
+                            error_message=str(e),
+                            completed_at=datetime.utcnow(),
+                            processing_time=processing_time
+                        )
+                    )
+                    if failed_agent_id:
+                        db.session.execute(
+                            update(AgentInstance)
+                            .where(AgentInstance.id == failed_agent_id)
+                            .values(
+                                total_tasks=AgentInstance.total_tasks + 1,
+                                failed_tasks=AgentInstance.failed_tasks + 1,
+                                current_load=AgentInstance.current_load - 1,
+                                status=case(
+                                    (AgentInstance.current_load - 1 <= 0, 'idle'),
+                                    else_=AgentInstance.status
+                                ),
+                                success_rate=(
+                                    AgentInstance.successful_tasks * 100.0 /
+                                    (AgentInstance.total_tasks + 1)
+                                )
+                            )
+                        )
+
+                self._invalidate_status(task_id)
+                if failed_agent_id:
+                    self._agent_available.set()
                 self._update_processing_stats(processing_time, False)
                 
             except Exception as db_error:
                 logger.error(f"Error updating failed task {task_id}: {db_error}")
     
+    async def aprocess_single_task(self, task_id: str):
+        """Async wrapper around _process_single_task
+
+        A task spends almost all of its wall time blocked on the LLM
+        round trip, so async callers offload the whole pipeline to a
+        worker thread and keep their event loop free to interleave
+        other tasks; database access stays on the sync session, which
+        is only ever touched from that thread.
+        """
+        await asyncio.to_thread(self._process_single_task, task_id)
+
+    def _reserve_agent(self, required_capabilities: List[str]):
+        """Reserve an agent for a task, atomically where possible
+
+        On Postgres a single UPDATE claims the best candidate and
+        bumps its load with FOR UPDATE SKIP LOCKED, closing the
+        pick-then-update race between workers. Other backends fall
+        back to the two-step find; the caller then performs the load
+        update itself. Returns (agent, already_reserved). The matching
+        pool handler is attached to the agent here, so execution later
+        is a single attribute load and call.
+        """
+        agent, reserved = self._reserve_agent_row(required_capabilities)
+        if agent is not None:
+            dispatch = self._get_dispatch_table()
+            agent._processor_fn = dispatch.get(agent.pool_name, dispatch['general'])
+        return agent, reserved
+
+    def _reserve_agent_row(self, required_capabilities: List[str]):
+        """Claim an agent row, atomically on Postgres"""
+        if db.engine.dialect.name == 'postgresql':
+            target_pool = _target_pool(required_capabilities)
+            pools = (target_pool,) if target_pool == 'general' else (target_pool, 'general')
+            for pool in pools:
+                try:
+                    agent_id = db.session.execute(
+                        _RESERVE_AGENT_SQL, {'pool': pool}
+                    ).scalar()
+                    if agent_id is not None:
+                        db.session.commit()
+                        return AgentInstance.query.get(agent_id), True
+                    db.session.rollback()
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error(f"Agent reservation failed for pool {pool}: {e}")
+            return None, True
+
+        return self._find_available_agent(required_capabilities), False
+
     def _find_available_agent(self, required_capabilities: List[str]) -> Optional[AgentInstance]:
         """Find an available agent for the task"""
-        # Determine target pool based on capabilities
-        target_pool = 'general'
-        
-        # Map capabilities to pools
-        capability_pool_map = {
-            'medical_diagnosis': 'healthcare',
-            'pharmacology_analysis': 'healthcare',
-            'insurance_navigation': 'healthcare',
-            'healthcare_finance': 'healthcare',
-            'wellness_coaching': 'healthcare',
-            'clinical_decision_support': 'healthcare',
-            'wealth_optimization': 'financial',
-            'debt_elimination': 'financial',
-            'tax_strategy': 'financial',
-            'retirement_planning': 'financial',
-            'business_finance': 'financial',
-            'market_intelligence': 'financial',
-            'sports_prediction': 'sports',
-            'market_education': 'sports',
-            'fantasy_sports': 'sports',
-            'compliance_monitoring': 'sports',
-            'sports_content': 'sports',
-            'analytics': 'sports',
-            'process_automation': 'business',
-            'workflow_optimization': 'business',
-            'project_management': 'business',
-            'team_coordination': 'business',
-            'strategic_planning': 'business',
-            'operations': 'business'
-        }
-        
-        # Find the most specific pool
-        for capability in required_capabilities:
-            if capability in capability_pool_map:
-                target_pool = capability_pool_map[capability]
-                break
-        
-        # Find available agent in target pool
+        target_pool = _target_pool(required_capabilities)
+
+        # Try the in-memory index first: a dict read plus a
+        # primary-key get instead of an ordered scan per task
+        agent = self._agent_from_index(target_pool)
+        if not agent and target_pool != 'general':
+            agent = self._agent_from_index('general')
+        if agent:
+            return agent
+
+        # Fall back to the ordered SELECT when the index is cold or
+        # every indexed candidate was taken in the last second
         agent = AgentInstance.query.filter_by(
             pool_name=target_pool,
             status='idle'
@@ -208,7 +553,7 @@ class TaskProcessor:
             AgentInstance.current_load,
             AgentInstance.success_rate.desc()
         ).first()
-        
+
         # Fallback to general pool
         if not agent and target_pool != 'general':
             agent = AgentInstance.query.filter_by(
@@ -220,65 +565,104 @@ class TaskProcessor:
                 AgentInstance.current_load,
                 AgentInstance.success_rate.desc()
             ).first()
-        
+
         return agent
     
     def _execute_task(self, task: TaskRequest, agent: AgentInstance) -> str:
         """Execute the task using the assigned agent"""
-        # Import here to avoid circular imports
-        from agent_pools import SpecializedAgentPools
-        from ai_providers import AIProviderManager
-        
-        # Get AI provider and specialized pools
-        ai_provider = AIProviderManager()
-        specialized_pools = SpecializedAgentPools(ai_provider)
-        
-        # Route to appropriate agent pool
-        pool_name = agent.pool_name
-        
-        if pool_name == 'healthcare':
-            return specialized_pools.process_healthcare_task(task.query)
-        elif pool_name == 'financial':
-            return specialized_pools.process_financial_task(task.query)
-        elif pool_name == 'sports':
-            return specialized_pools.process_sports_task(task.query)
-        elif pool_name == 'business':
-            return specialized_pools.process_business_task(task.query)
-        else:
-            return specialized_pools.process_general_task(task.query)
+        # The handler is normally attached at reservation; the lookup
+        # below only runs for agents that arrived some other way
+        handler = getattr(agent, '_processor_fn', None)
+        if handler is None:
+            dispatch = self._get_dispatch_table()
+            handler = dispatch.get(agent.pool_name, dispatch['general'])
+        return handler(task.query)
+
+    def _get_dispatch_table(self) -> Dict:
+        """Build the pool -> handler table once, lazily
+
+        Uses the shared SpecializedAgentPools singleton so per-task
+        execution is a dict lookup and a call instead of rebuilding
+        the whole domain-manager object graph.
+        """
+        if self._dispatch is None:
+            # Import here to avoid circular imports
+            from agent_pools import get_specialized_pools
+            pools = get_specialized_pools()
+            self._dispatch = {
+                'healthcare': pools.process_healthcare_task,
+                'financial': pools.process_financial_task,
+                'sports': pools.process_sports_task,
+                'business': pools.process_business_task,
+                'general': pools.process_general_task
+            }
+        return self._dispatch
     
     def _update_processing_stats(self, processing_time: float, success: bool):
-        """Update processing statistics"""
-        self.processing_stats['total_processed'] += 1
-        
+        """Update this worker's own stats slot"""
+        slot = self._per_worker_stats[getattr(self._worker_slot, 'index', 0)]
+        slot['total'] += 1
         if success:
-            self.processing_stats['successful'] += 1
+            slot['successful'] += 1
         else:
-            self.processing_stats['failed'] += 1
-        
-        # Update average processing time
-        total = self.processing_stats['total_processed']
-        current_avg = self.processing_stats['avg_processing_time']
-        self.processing_stats['avg_processing_time'] = (
-            (current_avg * (total - 1) + processing_time) / total
-        )
+            slot['failed'] += 1
+        slot['time_sum'] += processing_time
+
+    def _aggregate_stats(self) -> Dict:
+        """Sum the per-worker slots into the reported stats shape"""
+        total = successful = failed = 0
+        time_sum = 0.0
+        for slot in self._per_worker_stats:
+            total += slot['total']
+            successful += slot['successful']
+            failed += slot['failed']
+            time_sum += slot['time_sum']
+        return {
+            'total_processed': total,
+            'successful': successful,
+            'failed': failed,
+            'shed': self._shed_count,
+            'avg_processing_time': (time_sum / total) if total else 0.0
+        }
     
     def get_queue_status(self) -> Dict:
         """Get current queue status"""
         return {
-            'queue_size': self.task_queue.qsize(),
+            'queue_size': sum(len(task_heap) for task_heap in self.worker_queues),
+            'queue_bound': self._queue_bound,
+            'queue_high_water_mark': self._queue_high_water,
             'running': self.running,
             'max_workers': self.max_workers,
-            'stats': self.processing_stats.copy()
+            'stats': self._aggregate_stats()
         }
     
+    def _invalidate_status(self, task_id: str):
+        """Drop a cached status after a state transition"""
+        with self._status_cache_lock:
+            self._status_cache.pop(task_id, None)
+
     def get_task_status(self, task_id: str) -> Optional[Dict]:
-        """Get status of a specific task"""
+        """Get status of a specific task
+
+        Polling clients ask for the same task_id repeatedly, so
+        completed/failed results are served from the cache forever and
+        in-flight ones for up to the TTL before re-fetching.
+        """
+        now = time.monotonic()
+        with self._status_cache_lock:
+            entry = self._status_cache.get(task_id)
+            if entry is not None:
+                cached_at, payload = entry
+                if payload['status'] in ('completed', 'failed') or \
+                        now - cached_at < self._status_cache_ttl:
+                    self._status_cache.move_to_end(task_id)
+                    return payload
+
         task = TaskRequest.query.filter_by(task_id=task_id).first()
         if not task:
             return None
-        
-        return {
+
+        payload = {
             'task_id': task.task_id,
             'status': task.status,
             'created_at': task.created_at.isoformat(),
@@ -287,3 +671,11 @@ class TaskProcessor:
             'result': task.result,
             'error_message': task.error_message
         }
+
+        with self._status_cache_lock:
+            self._status_cache[task_id] = (now, payload)
+            self._status_cache.move_to_end(task_id)
+            if len(self._status_cache) > self._status_cache_max:
+                self._status_cache.popitem(last=False)
+
+        return payload
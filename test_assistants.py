@@ -8,6 +8,7 @@ import os
 import sys
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 # Add the project root to Python path
@@ -148,15 +149,20 @@ def main():
         
         results = []
         successful_tests = 0
-        
-        for domain, query, description in test_queries:
-            success, result = test_assistant_domain(domain, query, description)
-            results.append((domain, success, result))
-            if success:
-                successful_tests += 1
-            
-            # Small delay between tests
-            time.sleep(2)
+
+        # Each test is an independent I/O-bound API call, so run them
+        # concurrently: wall time is the slowest test, not the sum
+        with ThreadPoolExecutor(max_workers=len(test_queries)) as executor:
+            futures = {
+                executor.submit(test_assistant_domain, domain, query, description): domain
+                for domain, query, description in test_queries
+            }
+            for future in as_completed(futures):
+                domain = futures[future]
+                success, result = future.result()
+                results.append((domain, success, result))
+                if success:
+                    successful_tests += 1
         
         # Show thread statistics after testing
         show_thread_statistics()
@@ -0,0 +1,21 @@
+"""
+Time utilities - shared timestamp helpers for hot request paths
+"""
+
+import time
+from datetime import datetime
+
+_ts_cache = (0, '')
+
+def iso_now() -> str:
+    """Current UTC time in ISO format, cached at one-second granularity
+
+    High-QPS endpoints stamp every response; re-formatting the same
+    second over and over is pure allocator churn, so the formatted
+    string is reused until the clock ticks.
+    """
+    global _ts_cache
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache = (now, datetime.utcfromtimestamp(now).isoformat())
+    return _ts_cache[1]